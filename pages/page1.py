@@ -1,139 +1,54 @@
-import streamlit as st
-import networkx as nx
-import matplotlib.pyplot as plt
 import os
-from matplotlib import font_manager
-
-# --- matplotlib 한글 폰트 설정 ---
-# 시스템에 맑은 고딕(Malgun Gothic)이 있는 경우 사용하거나, 
-# 없다면 기본 sans-serif 폰트 중 한글을 지원하는 폰트를 사용하도록 설정
-try:
-    # 윈도우 사용자에게 가장 흔한 폰트
-    plt.rcParams['font.family'] = 'Malgun Gothic'
-except:
-    # 맑은 고딕이 없는 경우 (예: 리눅스/맥 환경) 대비
-    plt.rcParams['font.family'] = 'sans-serif'
-    
-plt.rcParams['axes.unicode_minus'] = False # 마이너스 폰트 깨짐 방지
-# ---------------------------------
-
-# --- 1. 공통 데이터 및 초기화 ---
-
-# 14종의 생물 데이터 (생물, 이모지, 영양 단계)
-ECO_DATA = {
-    "풀/나무": {"emoji": "🌳", "tl": "생산자"}, "도토리": {"emoji": "🌰", "tl": "생산자"},
-    "산수유": {"emoji": "🍒", "tl": "생산자"}, "메뚜기": {"emoji": "🦗", "tl": "1차 소비자"},
-    "토끼": {"emoji": "🐇", "tl": "1차 소비자"}, "애벌레": {"emoji": "🐛", "tl": "1차 소비자"},
-    "다람쥐": {"emoji": "🐿️", "tl": "1차 소비자"}, "오리": {"emoji": "🦆", "tl": "2차 소비자"}, 
-    "개구리": {"emoji": "🐸", "tl": "2차 소비자"}, "직박구리": {"emoji": "🐦", "tl": "2차 소비자"},
-    "뱀": {"emoji": "🐍", "tl": "3차 소비자"}, "족제비": {"emoji": "🦦", "tl": "3차 소비자"}, 
-    "여우": {"emoji": "🦊", "tl": "3차 소비자"}, "매": {"emoji": "🦅", "tl": "최종 소비자"}
-}
-
-TL_ORDER = ["생산자", "1차 소비자", "2차 소비자", "3차 소비자", "최종 소비자"]
-TL_MAP_KOR = {
-    "생산자": "🌿 생산자", "1차 소비자": "🥕 1차 소비자", 
-    "2차 소비자": "🐸 2차 소비자", "3차 소비자": "🐍 3차 소비자", 
-    "최종 소비자": "👑 최종 소비자"
-}
-INITIAL_POP = 50 
-
-# --- 2. 상태 초기화 및 리셋 함수 ---
-
-def reset_model():
-    """모형 구성을 초기화합니다."""
-    st.session_state.user_nodes = [] 
-    st.session_state.user_edges = []
-    st.session_state.user_pop = {}
-    st.session_state.is_chain_completed = False # 풍선 플래그 리셋
-    st.session_state.available_species = list(ECO_DATA.keys())
-
-if 'user_nodes' not in st.session_state:
-    # 초기화 시 메시지를 표시하기 위해 초기화 함수 대신 직접 로직 실행
-    st.session_state.user_nodes = [] 
-    st.session_state.user_edges = []
-    st.session_state.user_pop = {}
-    st.session_state.is_chain_completed = False 
-    st.session_state.available_species = list(ECO_DATA.keys())
-
-# --- 3. 시각화 및 검증 로직 ---
+
+import streamlit as st
+
+from utils.charts import network_spec, render_figures
+from utils.plotting import FONT_PATH
+from utils.warmup import start_warm_up
+from utils.ecosystem import (
+    SPECIES_NAMES, SPECIES_TL, TL_ORDER, TL_MAP_KOR, check_for_full_chain, species_label,
+)
+from utils.session import (
+    add_edge, add_species, available_species, checkout_version, has_edge, init_session_web, redo_edit,
+    render_chart_payload, render_export_button, render_memory_report, reset_model, undo_edit,
+)
+
+# --- 1. 상태 초기화 ---
+# 생물 카탈로그와 세션 상태 관리는 utils 모듈에서 공유합니다.
+
+init_session_web()
+start_warm_up() # 서버 워밍업이 아직 안 됐다면 백그라운드로 시작
+
+# --- 2. 시각화 및 검증 로직 ---
 
 def draw_current_ecosystem(nodes, edges, title):
-    """현재 구성된 먹이 관계를 시각화합니다."""
+    """현재 구성된 먹이 관계를 시각화합니다. (nodes, edges는 생물 ID 배열)"""
     
-    if not nodes:
+    if len(nodes) == 0:
         st.info("🎨 모형을 만들기 위해 아래에서 생물을 추가해주세요.")
-        return
+        return []
 
-    G = nx.DiGraph()
-    G.add_nodes_from(nodes)
-    G.add_edges_from(edges)
-    
-    fig, ax = plt.subplots(figsize=(10, 8))
-    pos = nx.spring_layout(G, seed=42, k=0.5) 
-    
     # 노드 색상: 영양 단계별로 다르게 설정
     color_map = {"생산자": 'lightgreen', "1차 소비자": 'yellow', "2차 소비자": 'orange', "3차 소비자": 'salmon', "최종 소비자": 'red'}
-    colors = [color_map.get(ECO_DATA.get(node, {}).get('tl'), 'skyblue') for node in nodes]
+    colors = [color_map.get(TL_ORDER[SPECIES_TL[node]], 'skyblue') for node in nodes.tolist()]
     
     # 노드 라벨: 이모지 + 이름
-    labels = {node: f"{ECO_DATA[node]['emoji']} {node}" for node in nodes if node in ECO_DATA}
+    labels = {node: species_label(node) for node in nodes.tolist()}
 
-    nx.draw_networkx_nodes(G, pos, node_color=colors, node_size=4000, alpha=0.9)
-    nx.draw_networkx_edges(G, pos, edge_color="gray", arrowsize=30, width=2)
-    
-    # 서버측 이미지 렌더링에서 한글을 보이게 하기 위해 로컬 TTF를 FontProperties로 직접 사용
-    font_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "fonts", "NanumGothic.ttf"))
-    
-    # *** (수정 1) fp를 None으로 초기화 ***
-    fp = None 
-    
-    if os.path.exists(font_path):
-        fp = font_manager.FontProperties(fname=font_path)
-        for n, label in labels.items():
-            x, y = pos[n]
-            ax.text(x, y, label, fontproperties=fp, fontsize=12, ha='center', va='center')
-    else:
-        nx.draw_networkx_labels(G, pos, labels, font_size=12)
+    # 그림은 렌더링 워커가 그리고, 본문 너비에 맞는 해상도의 이미지로 받아 옵니다.
+    spec = network_spec(nodes, edges, colors, labels, title, figsize=(10, 8), columns=1,
+                        node_size=4000, arrowsize=30, width=2, fontsize=12, title_size=15)
+    images = render_figures([spec])
+
+    if not os.path.exists(FONT_PATH):
         # 폰트가 없을 경우 경고 메시지를 띄워주면 디버깅에 좋습니다.
         st.warning("경고: 폰트 파일(NanumGothic.ttf)을 찾을 수 없습니다. 그래프의 한글이 깨질 수 있습니다.")
 
-    # *** (수정 2) 제목(title)에도 동일한 fontproperties(fp)를 적용 ***
-    ax.set_title(title, fontsize=15, fontproperties=fp)
-    
-    ax.axis('off')
-    st.pyplot(fig)
-
+    st.image(images[0], width="stretch")
+    return images
 
-def check_for_full_chain(G):
-    """생산자 -> 1차 -> 2차 -> 최종 소비자의 완전한 체인이 있는지 확인합니다."""
-    
-    # 1. 각 영양 단계의 노드 그룹화
-    tl_nodes = {tl: [] for tl in TL_ORDER}
-    for node in G.nodes:
-        if node in ECO_DATA:
-            tl = ECO_DATA[node]['tl']
-            if tl in tl_nodes:
-                tl_nodes[tl].append(node)
-                
-    # 2. 필수 영양 단계가 모두 존재하는지 확인 (생산자, 1차, 2차, 최종)
-    if not (tl_nodes["생산자"] and tl_nodes["1차 소비자"] and tl_nodes["2차 소비자"] and tl_nodes["최종 소비자"]):
-        return False
 
-    # 3. NetworkX를 이용해 경로 탐색 (BFS/DFS)
-    # P -> 1C -> 2C -> FC 경로가 하나라도 존재하는지 확인
-    
-    for p_node in tl_nodes["생산자"]:
-        for c1_node in tl_nodes["1차 소비자"]:
-            if G.has_edge(p_node, c1_node): # P -> 1C
-                for c2_node in tl_nodes["2차 소비자"]:
-                    if G.has_edge(c1_node, c2_node): # 1C -> 2C
-                        for fc_node in tl_nodes["최종 소비자"]:
-                            if G.has_edge(c2_node, fc_node): # 2C -> FC
-                                return True # 완전한 체인 발견!
-    return False
-
-# --- 4. Streamlit 페이지 구성 ---
+# --- 3. Streamlit 페이지 구성 ---
 
 st.title("🧱 1. 먹이 관계 모형 만들기 (연결 체험)")
 st.header("생물 카드를 골라 먹이 관계를 연결해 봐요!")
@@ -141,10 +56,27 @@ st.caption("초식동물(1차)은 식물(생산자)을, 육식동물(2차 이상
 
 st.markdown("---")
 
-# 리셋 버튼
-if st.button("🔄 모형 초기화 (다시 하기)"):
-    reset_model()
-    st.rerun() # 초기화 후 페이지를 새로고침하여 상태를 반영
+# 편집 기록 버튼: 되돌리기 / 다시 하기 / 초기화(리셋)
+history = st.session_state.web_history
+col_undo, col_redo, col_reset = st.columns([1, 1, 2])
+# (같은 실행 안에서 아래 편집 버튼이 기록을 바꿀 수 있으므로 버튼은 비활성화하지 않고 누를 때 확인합니다)
+with col_undo:
+    if st.button("↩️ 되돌리기"):
+        if history.can_undo:
+            undo_edit()
+            st.rerun()
+        st.info("더 되돌릴 편집이 없어요.")
+with col_redo:
+    if st.button("↪️ 다시 하기"):
+        if history.can_redo:
+            redo_edit()
+            st.rerun()
+        st.info("다시 할 편집이 없어요.")
+with col_reset:
+    if st.button("🔄 모형 초기화 (다시 하기)"):
+        reset_model()
+        st.rerun() # 초기화 후 페이지를 새로고침하여 상태를 반영
+
 
 # --- 1단계: 생물 (노드) 추가 (영양 단계별 도식화) ---
 st.subheader("1단계: 🐾 생물 친구들 추가하기 (영양 단계별)")
@@ -157,15 +89,12 @@ for i, tl in enumerate(TL_ORDER):
         st.markdown(f"**{TL_MAP_KOR[tl]}**")
         
         # 현재 단계에 해당하는 생물 목록 생성
-        available_in_tl = [
-            f"{ECO_DATA[name]['emoji']} {name}" for name in st.session_state.available_species
-            if name in ECO_DATA and ECO_DATA[name]['tl'] == tl
-        ]
+        available_in_tl = [sid for sid in available_species() if SPECIES_TL[sid] == i]
         
         # 이미 추가된 생물 목록 (색상으로 표시)
         added_in_tl = [
-            f"✅ {ECO_DATA[name]['emoji']} {name}" for name in st.session_state.user_nodes
-            if name in ECO_DATA and ECO_DATA[name]['tl'] == tl
+            f"✅ {species_label(sid)}" for sid in st.session_state.user_nodes
+            if SPECIES_TL[sid] == i
         ]
         
         # 추가된 생물이 있다면 표시
@@ -178,7 +107,8 @@ for i, tl in enumerate(TL_ORDER):
         if available_in_tl:
             tl_selection_map[tl] = st.selectbox(
                 f"추가할 {tl} 선택:",
-                options=['선택 안함'] + available_in_tl,
+                options=[-1] + available_in_tl,
+                format_func=lambda sid: '선택 안함' if sid < 0 else species_label(sid),
                 key=f"select_tl_{i}"
             )
         else:
@@ -188,14 +118,8 @@ for i, tl in enumerate(TL_ORDER):
 if st.button("➕ 선택한 생물들 생태계에 추가하기", key="add_selected_species"):
     newly_added_count = 0
     for tl, selection in tl_selection_map.items():
-        if selection and selection != '선택 안함':
-            clean_name = selection.split(' ')[1] 
-            
-            if clean_name not in st.session_state.user_nodes:
-                st.session_state.user_nodes.append(clean_name)
-                st.session_state.user_pop[clean_name] = INITIAL_POP
-                if clean_name in st.session_state.available_species:
-                    st.session_state.available_species.remove(clean_name)
+        if selection is not None and selection >= 0:
+            if add_species(selection):
                 newly_added_count += 1
                 
     if newly_added_count > 0:
@@ -211,13 +135,14 @@ st.caption("**먹이가 되는 생물** → **먹는 생물** 순서로 화살
 
 col_prey, col_predator, col_button = st.columns([1, 1, 0.5])
 
-# 현재 노드 목록 (순수 이름)
-node_options = st.session_state.user_nodes or ["생물을 먼저 추가하세요"]
+# 현재 노드 목록 (생물 ID, 없으면 안내 문구용 -1)
+node_options = st.session_state.user_nodes.tolist() or [-1]
+format_node = lambda sid: "생물을 먼저 추가하세요" if sid < 0 else SPECIES_NAMES[sid]
 
 with col_prey:
-    prey = st.selectbox("🍚 먹이 (화살표 꼬리):", options=node_options, key="select_prey")
+    prey = st.selectbox("🍚 먹이 (화살표 꼬리):", options=node_options, format_func=format_node, key="select_prey")
 with col_predator:
-    predator = st.selectbox("🍽️ 포식자 (화살표 머리):", options=node_options, key="select_predator")
+    predator = st.selectbox("🍽️ 포식자 (화살표 머리):", options=node_options, format_func=format_node, key="select_predator")
 
 with col_button:
     st.markdown("<br>", unsafe_allow_html=True)
@@ -226,17 +151,15 @@ with col_button:
             st.error("생물이 두 종류 이상 있어야 연결할 수 있어요!")
         elif prey == predator:
             st.error("같은 생물을 먹을 수는 없어요! 다시 골라봐.")
-        elif (prey, predator) in st.session_state.user_edges:
+        elif has_edge(prey, predator):
             st.warning("이미 연결된 관계입니다.")
         elif prey in st.session_state.user_nodes and predator in st.session_state.user_nodes:
-            st.session_state.user_edges.append((prey, predator))
-            st.success(f"**'{prey}'** → **'{predator}'** 관계 완성! 👍")
+            add_edge(prey, predator)
+            st.success(f"**'{SPECIES_NAMES[prey]}'** → **'{SPECIES_NAMES[predator]}'** 관계 완성! 👍")
             
             # 완전한 체인 검사 및 풍선 효과 발동
             if not st.session_state.is_chain_completed:
-                G_temp = nx.DiGraph()
-                G_temp.add_edges_from(st.session_state.user_edges)
-                if check_for_full_chain(G_temp):
+                if check_for_full_chain(st.session_state.user_edges):
                     st.session_state.is_chain_completed = True
                     st.balloons()
                     st.success("🎉 축하해요! 생산자부터 최종 소비자까지 이어지는 완전한 **먹이사슬**을 처음 완성했어요!")
@@ -245,9 +168,23 @@ with col_button:
 
 st.markdown("---")
 
+st.caption(f"🕘 현재 버전: {history.describe(history.current)} · 전체 {len(history)}개 버전")
+with st.expander("🕘 편집 기록 (예전 버전으로 돌아가기)"):
+    chosen_version = st.selectbox(
+        "돌아갈 버전:",
+        options=list(range(len(history) - 1, -1, -1)),
+        format_func=history.describe,
+        key="select_version",
+    )
+    if st.button("이 버전으로 돌아가기", key="checkout_version"):
+        checkout_version(chosen_version)
+        st.rerun()
+    st.caption("예전 버전은 2번 실험 페이지에서도 골라 실험할 수 있어요.")
+
 # --- 3단계: 모형 시각화 ---
 st.header("👀 내가 만든 먹이 모형")
-draw_current_ecosystem(st.session_state.user_nodes, st.session_state.user_edges, "모형 시각화 (색깔은 영양 단계를 나타냅니다)")
+chart_images = draw_current_ecosystem(st.session_state.user_nodes, st.session_state.user_edges, "모형 시각화 (색깔은 영양 단계를 나타냅니다)")
+render_chart_payload(chart_images)
 
 # --- 4단계: 설명글 추가 ---
 st.markdown("---")
@@ -261,6 +198,9 @@ st.markdown("""
 """)
 
 
-if st.session_state.user_edges:
+if len(st.session_state.user_edges):
     st.markdown("---")
-    st.info("✅ 먹이 모형 구성 완료! 이제 **[2. 생태계 안정성 실험]** 페이지로 가서 실험해 봅시다!")
\ No newline at end of file
+    st.info("✅ 먹이 모형 구성 완료! 이제 **[2. 생태계 안정성 실험]** 페이지로 가서 실험해 봅시다!")
+    render_export_button()
+
+render_memory_report()
@@ -1,192 +1,92 @@
-import streamlit as st
-import networkx as nx
-import matplotlib.pyplot as plt
 import os
-from matplotlib import font_manager
+import time
 
-# --- matplotlib 한글 폰트 설정 ---
-try:
-    plt.rcParams['font.family'] = 'Malgun Gothic'
-except:
-    plt.rcParams['font.family'] = 'sans-serif'
-    
-plt.rcParams['axes.unicode_minus'] = False # 마이너스 폰트 깨짐 방지
-# ---------------------------------
-
-# --- 1. 기본 데이터 (페이지 1의 데이터) ---
-ECO_DATA = {
-    "풀/나무": {"emoji": "🌳", "tl": "생산자"}, "도토리": {"emoji": "🌰", "tl": "생산자"},
-    "산수유": {"emoji": "🍒", "tl": "생산자"}, "메뚜기": {"emoji": "🦗", "tl": "1차 소비자"},
-    "토끼": {"emoji": "🐇", "tl": "1차 소비자"}, "애벌레": {"emoji": "🐛", "tl": "1차 소비자"},
-    "다람쥐": {"emoji": "🐿️", "tl": "1차 소비자"}, "오리": {"emoji": "🦆", "tl": "2차 소비자"}, 
-    "개구리": {"emoji": "🐸", "tl": "2차 소비자"}, "직박구리": {"emoji": "🐦", "tl": "2차 소비자"},
-    "뱀": {"emoji": "🐍", "tl": "3차 소비자"}, "족제비": {"emoji": "🦦", "tl": "3차 소비자"}, 
-    "여우": {"emoji": "🦊", "tl": "3차 소비자"}, "매": {"emoji": "🦅", "tl": "최종 소비자"}
-}
-
-TL_ORDER = ["생산자", "1차 소비자", "2차 소비자", "3차 소비자", "최종 소비자"]
-
-SIMPLE_ECO = {
-    "name": "단순한 먹이사슬",
-    "nodes": ["풀/나무", "토끼", "뱀"],
-    "edges": [("풀/나무", "토끼"), ("토끼", "뱀")],
-    "initial_population": {"풀/나무": 100, "토끼": 50, "뱀": 20},
-    "removal_factor": 0.5 
-}
-SPECIES_EMOJI = {
-    "풀/나무": "🌳", "도토리": "🌰", "산수유": "🍒", "메뚜기": "🦗", 
-    "토끼": "🐇", "애벌레": "🐛", "다람쥐": "🐿️", "오리": "🦆", 
-    "개구리": "🐸", "직박구리": "🐦", "뱀": "🐍", "족제비": "🦦", 
-    "여우": "🦊", "매": "🦅"
-}
-
-# --- 2. 시뮬레이션 핵심 로직 ---
-
-def run_simulation_step_by_step(ecosystem_data, change_target, change_type, change_value):
-    """특정 생물의 개체 수 변화에 따른 생태계 반응을 시뮬레이션합니다."""
-    
-    G = nx.DiGraph()
-    G.add_nodes_from(ecosystem_data["nodes"])
-    G.add_edges_from(ecosystem_data["edges"])
-    population = ecosystem_data["initial_population"].copy()
-    removal_factor = ecosystem_data.get("removal_factor", 0.4) 
-
-    initial_pop_copy = population.copy() 
-    simulation_log = [] 
-
-    # 1. 초기 충격 적용
-    original_pop = population.get(change_target, 0)
-    pop_change_amount = 0
-    
-    if original_pop == 0:
-        simulation_log.append(f"⚠️ **{change_target}**는 이미 0마리입니다. 충격을 줄 수 없습니다.")
-        return population, G, initial_pop_copy, simulation_log
-        
-    if change_type == "제거 (멸종)":
-        pop_change_amount = -original_pop
-        population[change_target] = 0
-        simulation_log.append(f"🔴 **{change_target}** 카드 **제거**! (개체수: {original_pop} → 0)")
+import numpy as np
+import streamlit as st
+
+from utils.cache import cached_simulation
+from utils.charts import animation_specs, ecosystem_spec, pyramid_spec, render_figures, stream_figures
+from utils.ecosystem import (
+    SIMPLE_ECO, SPECIES_NAMES, TL_ORDER, canonical_ecosystem, ecosystem_hash, filter_table,
+    format_log_record, iter_simulation_steps, log_table, population_change_table,
+)
+from utils.plotting import FONT_PATH
+from utils.session import (
+    clear_simulation, render_cache_report, render_chart_payload, render_memory_report, user_ecosystem,
+)
+from utils.warmup import start_warm_up
+
+# 생물 데이터, SIMPLE_ECO, 시뮬레이션 로직은 utils.ecosystem에서 공유합니다.
+
+# --- 1. 그래프 시각화 ---
+# 그림 명세는 utils.charts에서 만들고, 렌더링 워커 풀이 이미지로 그립니다.
+# 결과 이미지는 모든 세션이 공유합니다.
+
+def render_comparison_figures(nodes, edges, initial_pop):
+    """실험 전/후 먹이그물과 피라미드 4장을 한꺼번에 (병렬로) 렌더링합니다."""
+    if st.session_state.is_simulated:
+        after_pop, after_initial = st.session_state.simulated_pop, st.session_state.initial_pop_at_sim
+        after_titles = ("실험 후 (먹이그물)", "실험 후 (생태 피라미드)")
     else:
-        pop_change = int(original_pop * (change_value / 100))
-        population[change_target] = max(0, population[change_target] + pop_change)
-        pop_change_amount = population[change_target] - original_pop
-        
-        if pop_change_amount > 0:
-            simulation_log.append(f"🟢 **{change_target}** 개체수 **증가**! ({original_pop} → {population[change_target]})")
-        else:
-            simulation_log.append(f"🟠 **{change_target}** 개체수 **감소**! ({original_pop} → {population[change_target]})")
+        after_pop, after_initial = initial_pop, initial_pop
+        after_titles = ("실험 대기 중", "실험 대기 중")
 
-    
-    # 2. 연쇄 반응 시뮬레이션
-    for predator in G.successors(change_target):
-        if pop_change_amount < 0: 
-            decrease_factor = removal_factor if population[change_target] == 0 else 0.5
-            pop_decrease = int(population[predator] * decrease_factor)
-            population[predator] -= min(pop_decrease, population.get(predator, 0))
-            log_msg = f"📉 **{change_target}**의 먹이 감소로 **{predator}**의 개체수가 **-{pop_decrease} 감소**했어요."
-            simulation_log.append(log_msg)
-            
-    for prey in G.predecessors(change_target):
-        if pop_change_amount < 0: 
-            increase_factor = removal_factor * 1.5 if population[change_target] == 0 else 0.5
-            pop_increase = int(population[prey] * increase_factor)
-            population[prey] += pop_increase
-            log_msg = f"📈 **{change_target}** 포식자 감소로 **{prey}**의 개체수가 **+{pop_increase} 증가**했어요!"
-            simulation_log.append(log_msg)
-
-    return population, G, initial_pop_copy, simulation_log
-
-# --- 3. 피라미드 데이터 계산 함수 ---
-def get_trophic_level_populations(population_data):
-    """종별 개체수를 영양 단계별 총 개체수로 합산합니다."""
-    tl_pops = {tl: 0 for tl in TL_ORDER}
-    
-    for species, pop in population_data.items():
-        if species in ECO_DATA:
-            tl = ECO_DATA[species]['tl']
-            if tl in tl_pops:
-                tl_pops[tl] += pop
-                
-    return tl_pops
-
-# --- 4. 그래프 시각화 함수 ---
-
-# 4-1. 네트워크 그래프
-def draw_ecosystem(G, population, title, initial_pop, fp=None):
-    """먹이그물(네트워크)을 시각화하고 개체 수 변화를 색상으로 표현합니다."""
-    
-    # --- [수정] 그래프 크기 줄이기 (10, 8) -> (5, 4) ---
-    fig, ax = plt.subplots(figsize=(5, 4))
-    pos = nx.spring_layout(G, seed=42, k=0.5) 
+    return render_figures([
+        ecosystem_spec(nodes, edges, initial_pop, "실험 전 (먹이그물)", initial_pop),
+        pyramid_spec(initial_pop, "실험 전 (생태 피라미드)"),
+        ecosystem_spec(nodes, edges, after_pop, after_titles[0], after_initial),
+        pyramid_spec(after_pop, after_titles[1]),
+    ])
 
-    colors = []
-    
-    for node in G.nodes:
-        if node in initial_pop:
-            change = population.get(node, 0) - initial_pop[node]
-            if change > 0: colors.append('lightgreen')
-            elif change < 0: colors.append('red')
-            else: colors.append('skyblue')
-        else: colors.append('skyblue')
-
-    nx.draw_networkx_nodes(G, pos, node_color=colors, node_size=2000, alpha=0.9) # 노드 크기도 살짝 줄임
-    nx.draw_networkx_edges(G, pos, edge_color="gray", arrowsize=20, width=1.5)
-    
-    labels = {node: f"{SPECIES_EMOJI.get(node, '?')} {node}\n({population.get(node, '?')})" for node in G.nodes}
-    
-    if fp:
-        for n, label in labels.items():
-            x, y = pos[n]
-            ax.text(x, y, label, fontproperties=fp, fontsize=8, ha='center', va='center') # 폰트 크기 줄임
-    else:
-        nx.draw_networkx_labels(G, pos, labels, font_size=8) # 폰트 크기 줄임
 
-    ax.set_title(title, fontsize=12, fontproperties=fp) # 제목 폰트 크기 줄임
-    ax.axis('off')
-    st.pyplot(fig)
+# 애니메이션 프레임 하나를 보여 주는 최소 시간(초). 학생이 변화를 따라갈 수 있도록.
+FRAME_SECONDS = 0.8
 
-# 4-2. 생태 피라미드 그래프
-def draw_pyramid(population_data, title, fp=None):
-    """영양 단계별 개체수를 바탕으로 생태 피라미드를 시각화합니다."""
-    
-    tl_pops = get_trophic_level_populations(population_data)
-    
-    labels = TL_ORDER
-    populations = [tl_pops[tl] for tl in labels]
-    colors = ['lightgreen', 'yellow', 'orange', 'salmon', 'red']
-    y_pos = range(len(labels))
 
-    # --- [수정] 그래프 크기 줄이기 (10, 6) -> (5, 3) ---
-    fig, ax = plt.subplots(figsize=(5, 3)) 
-    
-    bars = ax.barh(y_pos, populations, color=colors, edgecolor='black', align='center', height=0.7)
-    
-    ax.set_yticks(y_pos, labels=labels, fontproperties=fp, fontsize=9) # 폰트 크기 줄임
-    ax.set_xlabel("개체 수", fontproperties=fp, fontsize=9)
-    ax.set_title(title, fontsize=12, fontproperties=fp) # 제목 폰트 크기 줄임
-    
-    for i, (bar, pop) in enumerate(zip(bars, populations)):
-        x_val = bar.get_width()
-        ax.text(x_val + 3, i, f"{pop}", va='center', ha='left', fontproperties=fp, fontsize=8) # 폰트 크기 줄임
+def play_shock_animation(ecosystem_data, target, change_type, change_value):
+    """충격이 퍼지는 과정을 한 단계씩 그려 같은 자리(st.empty)에 바꿔 가며 보여 줍니다.
 
-    ax.invert_yaxis()
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    
-    st.pyplot(fig)
+    시뮬레이션 제너레이터 -> 프레임 명세 제너레이터 -> 렌더링 스트림으로 이어져 있어서,
+    첫 프레임은 바로 나오고 서버는 앞서 그리는 몇 장만 들고 있습니다.
+    cached_simulation()과 같은 정규형 모형으로 돌리므로 단계 순서가 아래 로그 표와 같습니다.
+    """
+    ecosystem_data = canonical_ecosystem(ecosystem_data)
+    nodes, edges = ecosystem_data["nodes"], ecosystem_data["edges"]
+    steps = iter_simulation_steps(ecosystem_data, target, change_type, change_value)
+    frames = stream_figures(animation_specs(nodes, edges, ecosystem_data["initial_population"], steps))
+
+    st.subheader("🎬 충격이 퍼지는 과정")
+    frame = st.empty()
+    lines = []
+    shown_at = 0.0
+    for record, image in frames:
+        if record is not None:
+            lines.append(f"{len(lines) + 1}. {format_log_record(record)}")
+        time.sleep(max(0.0, FRAME_SECONDS - (time.perf_counter() - shown_at)))
+        with frame.container():
+            col1, col2 = st.columns(2)
+            col1.image(image, width="stretch")
+            col2.markdown("\n".join(lines) if lines else "⏳ 충격을 주기 전의 모습이에요.")
+        shown_at = time.perf_counter()
+
+
+# 표 높이: 행이 많으면 이 높이 안에서 스크롤 (보이는 행만 그려짐)
+TABLE_ROW_PX = 35
+TABLE_MAX_ROWS = 12
 
-    
-# --- 5. Streamlit 페이지 구성 ---
+
+def table_height(n_rows):
+    return TABLE_ROW_PX * (min(max(n_rows, 1), TABLE_MAX_ROWS) + 1) + 3
+
+
+# --- 2. Streamlit 페이지 구성 ---
 
 def main_simulation_page():
     st.title("🧪 2. 생태계 안정성 실험")
     st.header("특정 생물이 사라지면 생태계는 어떻게 될까요?")
+    start_warm_up()
 
-    font_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "fonts", "NanumGothic.ttf"))
-    fp = None
-    if os.path.exists(font_path):
-        fp = font_manager.FontProperties(fname=font_path)
-    elif 'fp_warned' not in st.session_state:
+    if not os.path.exists(FONT_PATH) and 'fp_warned' not in st.session_state:
         st.warning("경고: 폰트 파일(NanumGothic.ttf)을 찾을 수 없습니다. 그래프의 한글이 깨질 수 있습니다.")
         st.session_state.fp_warned = True 
 
@@ -194,31 +94,33 @@ def main_simulation_page():
     user_nodes = st.session_state.get('user_nodes', [])
     user_edges = st.session_state.get('user_edges', [])
 
-    if not user_edges:
+    # 편집 기록에서 화살표가 있는 버전은 현재 버전과 상관없이 (초기화한 뒤에도) 복사 없이 골라 실험할 수 있습니다.
+    history = st.session_state.get('web_history')
+    versions = [] if history is None else np.flatnonzero(history.versions["n_edges"] > 0)[::-1].tolist()
+    if not versions:
         st.error("⚠️ 먼저 **[1. 먹이 관계 모형 만들기]** 페이지에서 생물들을 연결해야 실험을 할 수 있어요! 기본 단순 모형으로 시작합니다.")
         selected_eco = SIMPLE_ECO
     else:
-        st.success(f"✨ 내가 만든 모형 ({len(user_nodes)}종)으로 실험을 시작합니다!")
-        selected_eco = {
-            "name": "내가 만든 모형",
-            "nodes": user_nodes,
-            "edges": user_edges,
-            "initial_population": st.session_state.user_pop,
-            "removal_factor": 0.4
-        }
-    
-    initial_pop_data = selected_eco['initial_population'].copy()
-    G_initial = nx.DiGraph()
-    G_initial.add_nodes_from(selected_eco["nodes"])
-    G_initial.add_edges_from(selected_eco["edges"])
-    G_initial.graph['initial_pop'] = initial_pop_data
-
-    # 세션 상태 초기화
-    if 'simulated_pop' not in st.session_state or st.session_state.simulated_pop is None:
-        st.session_state.simulated_pop = initial_pop_data.copy()
-        st.session_state.initial_pop_at_sim = initial_pop_data.copy()
-        st.session_state.is_simulated = False
-        st.session_state.simulation_log = []
+        version = st.sidebar.selectbox(
+            "🕘 실험할 모형 버전:",
+            options=versions,
+            index=versions.index(history.current) if history.current in versions else 0,
+            format_func=history.describe,
+        )
+        selected_eco = user_ecosystem(None if version == history.current else version)
+        if len(user_edges) == 0:
+            st.info("💡 현재 모형에는 화살표가 없어, 편집 기록의 예전 버전으로 실험합니다.")
+        st.success(f"✨ 내가 만든 모형 ({len(selected_eco['nodes'])}종, v{version})으로 실험을 시작합니다!")
+
+    initial_pop_data = selected_eco['initial_population']
+    nodes, edges = selected_eco["nodes"], selected_eco["edges"]
+
+    # 세션 상태 초기화 (실험할 모형이 바뀌면 이전 결과를 지움)
+    web_key = ecosystem_hash(selected_eco)
+    if 'simulated_pop' not in st.session_state or st.session_state.simulated_pop is None \
+            or st.session_state.get('sim_web') != web_key:
+        clear_simulation(initial_pop_data)
+        st.session_state.sim_web = web_key
 
     
     # --- 사이드바: 충격 입력 ---
@@ -226,7 +128,8 @@ def main_simulation_page():
     
     target_species = st.sidebar.selectbox(
         "⚡️ 충격을 줄 생물 선택:",
-        options=selected_eco["nodes"],
+        options=selected_eco["nodes"].tolist(),
+        format_func=lambda sid: SPECIES_NAMES[sid],
         help="이 생물의 개체 수에 변화를 줍니다."
     )
     
@@ -247,10 +150,16 @@ def main_simulation_page():
             help="-100은 모두 사라짐, 100은 두 배 증가를 의미해요."
         )
 
+    animate = st.sidebar.checkbox(
+        "🎬 단계별로 보기 (애니메이션)",
+        value=False,
+        help="충격이 먹이 관계를 따라 한 단계씩 퍼지는 모습을 보여 줘요."
+    )
+
     # --- 시뮬레이션 버튼 ---
     if st.sidebar.button("🔬 실험 시작! (시뮬레이션 실행)"):
         with st.spinner('생태계가 반응하는 중...'):
-            new_population, G_result, initial_pop_copy, log = run_simulation_step_by_step(
+            new_population, initial_pop_copy, log = cached_simulation(
                 selected_eco, target_species, change_type, change_value
             )
         st.session_state.simulated_pop = new_population
@@ -258,34 +167,34 @@ def main_simulation_page():
         st.session_state.is_simulated = True
         st.session_state.simulation_log = log
         st.success("실험 결과가 나왔어요! 아래를 확인해 보세요.")
+        if animate:
+            play_shock_animation(selected_eco, target_species, change_type, change_value)
 
 
     st.markdown("---")
     
     # --- 결과 시각화 및 비교 (네트워크 + 피라미드) ---
+    images = render_comparison_figures(nodes, edges, initial_pop_data)
+    render_chart_payload(images)
+    before_net, before_pyramid, after_net, after_pyramid = images
     col1, col2 = st.columns(2)
 
     with col1:
         st.subheader("1️⃣ 실험 전 (초기 상태)")
         st.markdown("---")
-        draw_ecosystem(G_initial, initial_pop_data, "실험 전 (먹이그물)", initial_pop_data, fp=fp)
+        st.image(before_net, width="stretch")
         st.markdown("---")
-        draw_pyramid(initial_pop_data, "실험 전 (생태 피라미드)", fp=fp)
+        st.image(before_pyramid, width="stretch")
 
 
     with col2:
         st.subheader("2️⃣ 실험 후 (변화 상태)")
         st.markdown("---")
-        if st.session_state.is_simulated:
-            draw_ecosystem(G_initial, st.session_state.simulated_pop, "실험 후 (먹이그물)", st.session_state.initial_pop_at_sim, fp=fp)
-            st.markdown("---")
-            draw_pyramid(st.session_state.simulated_pop, "실험 후 (생태 피라미드)", fp=fp)
-        else:
+        if not st.session_state.is_simulated:
             st.info("좌측에서 충격을 설정하고 '실험 시작!' 버튼을 눌러주세요.")
-            # --- [오류 수정] G_T -> G_initial ---
-            draw_ecosystem(G_initial, initial_pop_data, "실험 대기 중", initial_pop_data, fp=fp)
-            st.markdown("---")
-            draw_pyramid(initial_pop_data, "실험 대기 중", fp=fp)
+        st.image(after_net, width="stretch")
+        st.markdown("---")
+        st.image(after_pyramid, width="stretch")
 
     st.markdown("---")
     
@@ -293,32 +202,44 @@ def main_simulation_page():
     if st.session_state.is_simulated:
         st.header("🔍 상세 분석: 어떤 생물이 변했을까요?")
         
+        # 생물 수나 로그 길이와 관계없이 표 두 개로 보여 줍니다. (정렬/스크롤은 표 안에서)
         with st.expander("📝 충격이 전파되는 과정 (로그 보기)"):
-            for step in st.session_state.simulation_log:
-                st.markdown(f"- {step}")
+            log = log_table(st.session_state.simulation_log)
+            st.dataframe(
+                log, hide_index=True, width="stretch", height=table_height(len(log["단계"])),
+                column_config={"설명": st.column_config.TextColumn(width="large")},
+            )
 
-        # 메트릭 스크롤 방지를 위해 컬럼 개수 제한 (5개씩)
-        nodes_list = selected_eco["nodes"]
-        num_nodes = len(nodes_list)
-        cols_per_row = 5
-        
-        for i in range(0, num_nodes, cols_per_row):
-            cols = st.columns(cols_per_row)
-            for j, node in enumerate(nodes_list[i:i+cols_per_row]):
-                initial = st.session_state.initial_pop_at_sim.get(node, 0)
-                current = st.session_state.simulated_pop.get(node, 0)
-                delta_val = current - initial
-                delta_str = f"{'+' if delta_val > 0 else ''}{delta_val}"
-                
-                with cols[j]:
-                    st.metric(
-                        label=f"{SPECIES_EMOJI.get(node, '?')} {node}",
-                        value=f"{current} 마리",
-                        delta=delta_str,
-                        delta_color="off" if delta_val == 0 else ("inverse" if delta_val < 0 else "normal")
-                    )
+        table = population_change_table(
+            selected_eco["nodes"], st.session_state.initial_pop_at_sim, st.session_state.simulated_pop
+        )
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            levels = st.multiselect(
+                "🔎 영양 단계로 거르기:", TL_ORDER, default=[], placeholder="모든 영양 단계",
+            )
+        with col2:
+            changed_only = st.toggle("변한 생물만 보기", value=False)
+
+        mask = np.ones(len(table["생물"]), dtype=bool)
+        if levels:
+            mask &= np.isin(table["영양 단계"], levels)
+        if changed_only:
+            mask &= table["변화"] != 0
+        rows = filter_table(table, mask)
+        st.dataframe(
+            rows, hide_index=True, width="stretch", height=table_height(int(mask.sum())),
+            column_config={
+                "실험 전": st.column_config.NumberColumn(format="%d 마리"),
+                "실험 후": st.column_config.NumberColumn(format="%d 마리"),
+                "변화": st.column_config.NumberColumn(format="%+d"),
+                "변화율(%)": st.column_config.NumberColumn(format="%+.1f%%"),
+            },
+        )
         
         st.info("✅ **핵심 발견:** 화살표 연결이 많을수록 (복잡할수록) 한 생물의 충격에 다른 생물들이 덜 피해를 입고 살아남을 수 있어요! 이것이 **안정성**이랍니다.")
 
 if __name__ == "__main__":
-    main_simulation_page()
\ No newline at end of file
+    main_simulation_page()
+    render_memory_report()
+    render_cache_report()
\ No newline at end of file
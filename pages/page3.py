@@ -1,107 +1,61 @@
-import streamlit as st
-import networkx as nx
-import matplotlib.pyplot as plt
-import os  # (수정) 폰트 경로 탐색을 위해 os import 추가
-from matplotlib import font_manager  # (수정) 폰트 관리를 위해 font_manager import 추가
+import os
 
-# --- matplotlib 한글 폰트 설정 ---
-try:
-    plt.rcParams['font.family'] = 'Malgun Gothic'
-except:
-    plt.rcParams['font.family'] = 'sans-serif'
-    
-plt.rcParams['axes.unicode_minus'] = False # 마이너스 폰트 깨짐 방지
-# ---------------------------------
+import streamlit as st
 
-# 페이지 1과 동일한 이모지 및 시각화 함수 사용
-SPECIES_EMOJI = {
-    "풀/나무": "🌳", "도토리": "🌰", "산수유": "🍒", "메뚜기": "🦗", 
-    "토끼": "🐇", "애벌레": "🐛", "다람쥐": "🐿️", "오리": "🦆", 
-    "개구리": "🐸", "직박구리": "🐦", "뱀": "🐍", "족제비": "🦦", 
-    "여우": "🦊", "매": "🦅"
-}
+from utils.charts import network_spec, render_figures
+from utils.ecosystem import SPECIES_TL, TL_COLORS, species_label, stability_score
+from utils.plotting import FONT_PATH
+from utils.session import render_chart_payload, render_export_button
+from utils.warmup import start_warm_up
 
-# 페이지 1의 데이터 재정의 (폰트 설정에 필요)
-ECO_DATA = {
-    "풀/나무": {"emoji": "🌳", "tl": "생산자"}, "도토리": {"emoji": "🌰", "tl": "생산자"},
-    "산수유": {"emoji": "🍒", "tl": "생산자"}, "메뚜기": {"emoji": "🦗", "tl": "1차 소비자"},
-    "토끼": {"emoji": "🐇", "tl": "1차 소비자"}, "애벌레": {"emoji": "🐛", "tl": "1차 소비자"},
-    "다람쥐": {"emoji": "🐿️", "tl": "1차 소비자"}, "오리": {"emoji": "🦆", "tl": "2차 소비자"}, 
-    "개구리": {"emoji": "🐸", "tl": "2차 소비자"}, "직박구리": {"emoji": "🐦", "tl": "2차 소비자"},
-    "뱀": {"emoji": "🐍", "tl": "3차 소비자"}, "족제비": {"emoji": "🦦", "tl": "3차 소비자"}, 
-    "여우": {"emoji": "🦊", "tl": "3차 소비자"}, "매": {"emoji": "🦅", "tl": "최종 소비자"}
-}
+# 생물 데이터는 페이지 1과 같은 utils.ecosystem 카탈로그를 사용합니다.
 
 def draw_final_ecosystem(nodes, edges, title):
-    if not nodes:
-        return
+    if len(nodes) == 0:
+        return []
 
-    G = nx.DiGraph()
-    G.add_nodes_from(nodes)
-    G.add_edges_from(edges)
-    
-    # --- [수정] 그래프 크기 줄이기 (10, 8) -> (5, 4) ---
-    fig, ax = plt.subplots(figsize=(5, 4))
-    pos = nx.spring_layout(G, seed=42, k=0.5) 
-    
     # 노드 색상: 영양 단계별로 다르게 설정
-    color_map = {"생산자": 'lightgreen', "1차 소비자": 'yellow', "2차 소비자": 'orange', "3차 소비자": 'salmon', "최종 소비자": 'red'}
-    colors = [color_map.get(ECO_DATA.get(node, {}).get('tl'), 'skyblue') for node in nodes]
+    colors = [TL_COLORS[SPECIES_TL[node]] for node in nodes.tolist()]
+    labels = {node: species_label(node) for node in nodes.tolist()}
 
-    # --- [수정] 노드 및 엣지 크기 줄이기 ---
-    nx.draw_networkx_nodes(G, pos, node_color=colors, node_size=2000, alpha=0.9)
-    nx.draw_networkx_edges(G, pos, edge_color="gray", arrowsize=20, width=1.5)
-    
-    labels = {node: f"{SPECIES_EMOJI.get(node, '?')} {node}" for node in nodes if node in ECO_DATA}
+    # --- [수정] 그래프 크기 줄이기 (10, 8) -> (5, 4), 노드/엣지/폰트 크기 줄이기 ---
+    spec = network_spec(nodes, edges, colors, labels, title, figsize=(5, 4), columns=1,
+                        node_size=2000, arrowsize=20, width=1.5, fontsize=8, title_size=12)
+    images = render_figures([spec])
 
-    # 폰트 경로 및 fp 초기화
-    font_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "fonts", "NanumGothic.ttf"))
-    fp = None
-    
-    if os.path.exists(font_path):
-        fp = font_manager.FontProperties(fname=font_path)
-        for n, label in labels.items():
-            x, y = pos[n]
-            # --- [수정] 폰트 크기 줄이기 (12) -> (8) ---
-            ax.text(x, y, label, fontproperties=fp, fontsize=8, ha='center', va='center')
-    else:
-        # 폰트가 없을 경우 기본 라벨 함수 사용
-        nx.draw_networkx_labels(G, pos, labels, font_size=8) # 폰트 크기 줄임
-        if 'fp_warned_p3' not in st.session_state: # 3페이지 경고 중복 방지
-             st.warning("경고: 폰트 파일(NanumGothic.ttf)을 찾을 수 없습니다. 그래프의 한글이 깨질 수 있습니다.")
-             st.session_state.fp_warned_p3 = True
+    if not os.path.exists(FONT_PATH) and 'fp_warned_p3' not in st.session_state: # 3페이지 경고 중복 방지
+        st.warning("경고: 폰트 파일(NanumGothic.ttf)을 찾을 수 없습니다. 그래프의 한글이 깨질 수 있습니다.")
+        st.session_state.fp_warned_p3 = True
 
-    # --- [수정] 제목 폰트 크기 줄이기 (15) -> (12) ---
-    ax.set_title(title, fontsize=12, fontproperties=fp)
-    
-    ax.axis('off')
-    st.pyplot(fig)
+    st.image(images[0], width="stretch")
+    return images
 
 # --- Streamlit 페이지 구성 ---
 st.title("💯 3. 모형 완성 확인 및 개념 퀴즈")
 st.header("내가 만든 생태계가 얼마나 튼튼할까요?")
+start_warm_up() # 서버 워밍업이 아직 안 됐다면 백그라운드로 시작
 
 # 사용자 정의 모형 로드
 user_nodes = st.session_state.get('user_nodes', [])
 user_edges = st.session_state.get('user_edges', [])
 
-if user_edges:
+if len(user_edges):
     st.subheader(f"✨ 내가 만든 최종 모형 ({len(user_nodes)} 종, {len(user_edges)} 관계)")
-    draw_final_ecosystem(user_nodes, user_edges, "최종 사용자 정의 먹이그물 모형")
+    render_chart_payload(draw_final_ecosystem(user_nodes, user_edges, "최종 사용자 정의 먹이그물 모형"))
     
     # 복잡도 계산
-    stability_score = len(user_edges) / len(user_nodes) if len(user_nodes) > 0 else 0
+    score = stability_score(user_nodes, user_edges)
     
     st.markdown("---")
     st.subheader("📊 모형 복잡도 점수")
     
     # 복잡도 게이지 시각화 (간단한 bar chart 사용)
-    score_level = max(0, min(2, stability_score))
-    st.progress(score_level / 2.0, text=f"복잡도 점수: {stability_score:.2f}")
+    score_level = max(0, min(2, score))
+    st.progress(score_level / 2.0, text=f"복잡도 점수: {score:.2f}")
 
-    if stability_score > 1.5:
+    if score > 1.5:
         st.success(f"🥳 아주 좋아요! 연결이 많은 **복잡한 먹이그물**이에요! 생태계가 튼튼해요.")
-    elif stability_score < 1.0:
+    elif score < 1.0:
         st.error(f"⚠️ 연결이 적은 **단순한 먹이사슬**에 가까워요. 충격에 약할 수 있어요.")
     else:
         st.warning(f"🤔 중간 복잡도입니다. 연결을 더 늘려볼까요?")
@@ -135,6 +89,7 @@ if user_edges:
 
     st.markdown("---")
     st.info("🎉 모든 학습을 마쳤어요! **'먹이그물이 복잡할수록 생태계는 안정적이다'**라는 점을 꼭 기억하세요!")
+    render_export_button()
     
 else:
     st.warning("⚠️ 페이지 1에서 '먹이 관계 모형 만들기'를 먼저 진행하고 오세요!")
\ No newline at end of file
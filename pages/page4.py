@@ -0,0 +1,105 @@
+import os
+import time
+
+import streamlit as st
+
+from utils.ecosystem import SIMPLE_ECO, SPECIES_NAMES, TL_ORDER, SPECIES_TL, species_label
+from utils.lattice import GRID_SIZE, Lattice, density_png, richness_png
+from utils.session import user_ecosystem
+from utils.warmup import start_warm_up
+
+# 격자 시뮬레이션 엔진은 utils.lattice에 있습니다. (한 단계 = 모든 칸을 numpy로 한꺼번에 갱신)
+
+SETTLE_STEPS = 50   # 충격 전에 격자가 자리 잡도록 먼저 돌리는 단계 수
+FRAME_EVERY = 10    # 몇 단계마다 화면을 새로 그릴지
+MAX_TILES = 8
+
+
+def lattice_frame(lattice, watch, compute_seconds):
+    """현재 격자 상태를 (종 수 지도 + 관찰할 생물 밀도 지도) 한 줄로 보여 줍니다."""
+    cols = st.columns(1 + len(watch))
+    with cols[0]:
+        st.image(richness_png(lattice), width="stretch")
+        st.caption("🌍 살아 있는 종 수 (진할수록 많음)")
+    for col, sid in zip(cols[1:], watch):
+        with col:
+            st.image(density_png(lattice, sid), width="stretch")
+            st.caption(f"{species_label(sid)} 밀도")
+
+    occupied = lattice.occupied()
+    st.markdown(" · ".join(
+        f"{species_label(sid)} **{share:.0%}**" for sid, share in zip(lattice.nodes.tolist(), occupied.tolist())
+    ))
+    st.caption(f"⏱️ {lattice.steps}단계 · 초당 {lattice.steps / max(compute_seconds, 1e-9):.0f}단계 계산 "
+               f"({GRID_SIZE}×{GRID_SIZE} 격자, {lattice.tiles}개 띠)")
+
+
+# --- Streamlit 페이지 구성 ---
+st.title("🗺️ 4. 공간 생태계 실험 (격자)")
+st.header("한 곳에서 생물이 사라지면, 그 빈자리는 어디까지 퍼질까요?")
+start_warm_up()
+
+if len(st.session_state.get('user_edges', [])) == 0:
+    st.info("💡 **[1. 먹이 관계 모형 만들기]**에서 만든 먹이그물이 없어 기본 단순 모형으로 실험합니다.")
+    eco = SIMPLE_ECO
+else:
+    eco = user_ecosystem()
+    st.success(f"✨ 내가 만든 모형 ({len(eco['nodes'])}종)의 생물들이 {GRID_SIZE}×{GRID_SIZE} 땅에 퍼져 삽니다.")
+
+nodes, edges = eco["nodes"], eco["edges"]
+species = nodes.tolist()
+
+st.markdown(
+    """
+    땅을 작은 칸으로 나누고, 칸마다 각 생물이 얼마나 많은지(밀도)를 계산합니다.
+    - 🌱 생산자는 칸마다 자라고, 🐛 소비자는 **같은 칸의 먹이**를 먹어야 살 수 있어요.
+    - 생물들은 조금씩 **옆 칸으로 퍼져** 나갑니다.
+    - 가운데 원 모양 구역에서 한 생물을 없애면, 그 영향이 먹이그물과 땅을 따라 어떻게 번지는지 관찰해 보세요!
+    """
+)
+
+# --- 1. 실험 설정 ---
+col1, col2 = st.columns(2)
+with col1:
+    target = st.selectbox("🎯 사라지게 할 생물:", species, format_func=species_label)
+    radius = st.slider("⭕ 사라지는 구역의 반지름 (칸):", 8, GRID_SIZE // 2, GRID_SIZE // 8, step=8)
+    persistent = st.checkbox("🏚️ 서식지 파괴 (그 구역에 다시 들어올 수 없음)", value=False)
+with col2:
+    watch = st.multiselect(
+        "👀 밀도 지도를 볼 생물:", species, default=species[:3], format_func=species_label, max_selections=4,
+    )
+    steps = st.slider("⏩ 충격 후 진행할 단계 수:", 50, 1000, 300, step=50)
+    multi_core = st.checkbox(
+        f"⚙️ 여러 코어로 나눠 계산 (이 서버: {os.cpu_count() or 1}코어)", value=False,
+        help="격자를 가로 띠로 나눠 동시에 계산합니다. 결과는 같고 속도만 달라집니다.",
+    )
+
+st.caption("🎨 밀도 지도는 영양 단계 색으로 그립니다: " + " · ".join(
+    f"{TL_ORDER[tl]} {', '.join(SPECIES_NAMES[s] for s in species if SPECIES_TL[s] == tl)}"
+    for tl in sorted(set(SPECIES_TL[species].tolist()))
+))
+
+# --- 2. 실험 실행 (프레임을 한 자리에서 바꿔 그리기) ---
+if st.button("▶️ 격자 실험 시작", type="primary"):
+    tiles = min(MAX_TILES, os.cpu_count() or 1) if multi_core else 1
+    lattice = Lattice(nodes, edges, tiles=tiles)
+    frame = st.empty()
+    try:
+        t0 = time.perf_counter()
+        lattice.step(SETTLE_STEPS)
+        lattice.shock_local_extinction(target, radius=radius, persistent=persistent)
+        compute = time.perf_counter() - t0
+        for _ in range(steps // FRAME_EVERY):
+            t0 = time.perf_counter()
+            lattice.step(FRAME_EVERY)
+            compute += time.perf_counter() - t0  # 그림 그리는 시간은 빼고 계산 속도만
+            with frame.container():
+                lattice_frame(lattice, watch, compute)
+    finally:
+        lattice.close()
+
+    lost = [sid for sid, share in zip(species, lattice.occupied().tolist()) if share == 0]
+    if lost:
+        st.error(f"💀 격자 전체에서 사라진 생물: {', '.join(species_label(s) for s in lost)}")
+    else:
+        st.success("🌿 모든 생물이 격자 어딘가에 살아남았어요. 빈자리가 다시 채워졌는지 지도를 확인해 보세요!")
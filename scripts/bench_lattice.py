@@ -0,0 +1,59 @@
+"""격자(공간) 생태계 시뮬레이션 속도 측정 (페이지 4, utils.lattice).
+
+기본 모형(3종)과 14종 전체 먹이그물을 256×256 격자에서 돌려 초당 단계 수와
+프레임 이미지(종 수 지도 PNG) 한 장을 만드는 시간을 잽니다. 띠(tile)로 나눠
+여러 코어로 계산한 결과가 한 코어 결과와 똑같은지도 확인합니다.
+
+    python scripts/bench_lattice.py              # 한 코어 / CPU 수만큼 띠
+    python scripts/bench_lattice.py --tiles 4 --steps 200
+
+한 코어 결과가 MIN_STEPS_PER_SECOND보다 느리면 종료 코드 1로 끝납니다.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.ecosystem import FULL_ECO, SIMPLE_ECO  # noqa: E402
+from utils.lattice import GRID_SIZE, Lattice, richness_png, steps_per_second  # noqa: E402
+
+MIN_STEPS_PER_SECOND = 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=GRID_SIZE)
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--tiles", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(f"격자 {args.size}×{args.size}, {args.steps}단계, CPU {os.cpu_count()}개")
+    slow = False
+    for eco in (SIMPLE_ECO, FULL_ECO):
+        nodes, edges = eco["nodes"], eco["edges"]
+        single = Lattice(nodes, edges, size=args.size)
+        tiled = Lattice(nodes, edges, size=args.size, tiles=args.tiles)
+        single.step(5)  # 첫 계산(메모리 할당)은 측정에서 제외
+        tiled.step(5)
+        sps_single = steps_per_second(single, args.steps)
+        sps_tiled = steps_per_second(tiled, args.steps)
+        same = np.array_equal(single.density, tiled.density)
+        tiled.close()
+
+        t0 = time.perf_counter()
+        frame = richness_png(single)
+        frame_ms = (time.perf_counter() - t0) * 1000
+
+        print(f"{eco['name']:<10} {len(nodes):>2}종  한 코어 {sps_single:7.1f} 단계/초  "
+              f"띠 {args.tiles}개 {sps_tiled:7.1f} 단계/초  결과 같음 {same}  "
+              f"프레임 {len(frame):,} B ({frame_ms:.1f}ms)")
+        slow |= sps_single < MIN_STEPS_PER_SECOND or not same
+    return 1 if slow else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""페이지 2 렌더링 부하 벤치마크: 직접 렌더링 vs 렌더링 워커 풀.
+
+동시에 접속한 학생 세션(스레드) N개가 각각 여러 번 화면을 갱신(rerun)하면서
+페이지 2의 그래프 4장을 새로 그리는 상황을 흉내 냅니다. 캐시가 맞지 않도록
+매 rerun마다 개체수를 바꿉니다. rerun 한 번의 지연 시간 분포(p50/p95/p99)를 비교합니다.
+
+그와 동시에 그래프를 그리지 않는 가벼운 rerun(페이지 1 조작 등, 시뮬레이션 한 번)을
+20ms마다 실행하는 "probe" 세션의 지연 시간도 잽니다. 렌더링이 GIL을 잡고 있으면
+이 값이 크게 늘어납니다.
+
+    python scripts/bench_render.py                  # 30 세션, 세션당 5회 rerun
+    python scripts/bench_render.py --sessions 30 --reruns 10 --workers 4
+
+지금까지의 결과는 1코어 환경뿐입니다. (30세션 x 5회: p99 풀 32.7초, 직접 26.9초)
+여러 코어 서버에서 풀이 p99를 줄이는지는 아직 재지 않았습니다.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.charts import ecosystem_spec, pyramid_spec  # noqa: E402
+from utils.ecosystem import FULL_ECO as WEB, run_simulation_step_by_step  # noqa: E402
+from utils.render import render_spec  # noqa: E402
+from utils.render_pool import AUTO_WORKERS, RenderPool  # noqa: E402
+
+
+def page2_specs(rng):
+    """rerun 한 번에 필요한 그림 명세 4장 (매번 다른 개체수)."""
+    initial = WEB["initial_population"]
+    after = initial + rng.integers(-40, 40, size=initial.shape).astype(initial.dtype)
+    nodes, edges = WEB["nodes"], WEB["edges"]
+    return [
+        ecosystem_spec(nodes, edges, initial, "실험 전 (먹이그물)", initial),
+        pyramid_spec(initial, "실험 전 (생태 피라미드)"),
+        ecosystem_spec(nodes, edges, after, "실험 후 (먹이그물)", initial),
+        pyramid_spec(after, "실험 후 (생태 피라미드)"),
+    ]
+
+
+def percentiles(latencies):
+    ms = np.array(latencies) * 1000
+    return "   ".join(f"p{q} {np.percentile(ms, q):8.1f} ms" for q in (50, 95, 99))
+
+
+def run(mode, sessions, reruns, pool=None):
+    latencies, probe = [], []
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def light_session():
+        while not done.is_set():
+            t0 = time.perf_counter()
+            run_simulation_step_by_step(WEB, 0, "제거 (멸종)", 0)
+            probe.append(time.perf_counter() - t0)
+            time.sleep(0.02)
+
+    def session(seed):
+        rng = np.random.default_rng(seed)
+        for _ in range(reruns):
+            specs = page2_specs(rng)
+            t0 = time.perf_counter()
+            if mode == "inline":
+                [render_spec(spec) for spec in specs]
+            else:
+                pool.render_many(specs)
+            with lock:
+                latencies.append(time.perf_counter() - t0)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    prober = threading.Thread(target=light_session)
+    t0 = time.perf_counter()
+    prober.start()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    done.set()
+    prober.join()
+
+    print(f"{mode:<8} page 2 rerun  {percentiles(latencies)}   {len(latencies) / wall:6.1f} rerun/s")
+    print(f"{'':<8} light rerun   {percentiles(probe)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=30)
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=max(1, AUTO_WORKERS))
+    args = parser.parse_args()
+
+    print(f"세션 {args.sessions}개 x rerun {args.reruns}회, 워커 {args.workers}개, CPU {os.cpu_count()}개")
+    render_spec(page2_specs(np.random.default_rng(0))[0])  # matplotlib 로딩은 측정에서 제외
+    run("inline", args.sessions, args.reruns)
+
+    pool = RenderPool(workers=args.workers, max_pending=args.workers * 4, queue_timeout=60)
+    pool.warm()
+    run("pool", args.sessions, args.reruns, pool=pool)
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""큰 합성 먹이그물로 시뮬레이션/배치/렌더링 경로의 속도를 잽니다.
+
+utils.synthetic으로 캐스케이드/니치 모형 먹이그물을 만들고 단계별 소요 시간을 보고합니다.
+- 생성: 간선과 영양 단계 만들기
+- 해시: ecosystem_hash (공유 캐시 키)
+- 시뮬레이션: 관계가 가장 많은 생물을 제거하는 run_simulation_step_by_step
+- 배치/그리기: cached_layout(500종 이상은 영양 단계 배치)과 먹이그물 그림 (--draw-max종 이하만)
+- 피라미드: 영양 단계별 합산과 피라미드 그림
+
+    python scripts/bench_synthetic.py                           # 1,000 / 10,000 / 100,000종
+    python scripts/bench_synthetic.py --sizes 1000 5000 --links 20 --model cascade
+
+연결도는 C = --links / S (생물 한 종당 평균 관계 수가 --links가 되도록) 입니다.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.cache import cached_layout  # noqa: E402
+from utils.charts import network_spec, pyramid_spec  # noqa: E402
+from utils.ecosystem import TL_COLORS, ecosystem_hash, run_simulation_step_by_step  # noqa: E402
+from utils.render import render_spec  # noqa: E402
+from utils.synthetic import MODELS, connectance_of, synthetic_ecosystem  # noqa: E402
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - t0) * 1000
+
+
+def bench(model, size, links, seed, draw_max):
+    connectance = min(links / size, 0.25)
+    eco, gen_ms = timed(synthetic_ecosystem, model, size, connectance, seed)
+    nodes, edges = eco["nodes"], eco["edges"]
+    _, hash_ms = timed(ecosystem_hash, eco)
+
+    degree = np.bincount(edges.ravel(), minlength=size)
+    target = int(np.argmax(degree))
+    (new_pop, _, log), sim_ms = timed(run_simulation_step_by_step, eco, target, "제거 (멸종)", 0)
+
+    spec = pyramid_spec(new_pop, "피라미드", species_tl=eco["species_tl"])
+    image, pyramid_ms = timed(render_spec, spec)
+
+    row = {
+        "model": model, "species": size, "relations": len(edges), "C": connectance_of(eco),
+        "levels": np.bincount(eco["species_tl"], minlength=5).tolist(),
+        "generate": gen_ms, "hash": hash_ms, "simulate": sim_ms, "log": len(log), "pyramid": pyramid_ms,
+        "layout": None, "draw": None,
+    }
+    if size <= draw_max:
+        _, row["layout"] = timed(cached_layout, nodes, edges, eco["species_tl"])
+        colors = [TL_COLORS[tl] for tl in eco["species_tl"].tolist()]
+        labels = {n: "" for n in nodes.tolist()}  # 이름표는 그리지 않음 (점과 화살표만)
+        spec = network_spec(nodes, edges, colors, labels, eco["name"], figsize=(5, 4), columns=1,
+                            node_size=10, arrowsize=3, width=0.2, fontsize=1, species_tl=eco["species_tl"])
+        _, row["draw"] = timed(render_spec, spec)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--model", choices=[*MODELS, "all"], default="all")
+    parser.add_argument("--links", type=float, default=10.0, help="생물 한 종당 평균 관계 수 (C·S)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--draw-max", type=int, default=1000, help="배치/먹이그물 그림을 잴 최대 생물 수")
+    args = parser.parse_args()
+
+    models = list(MODELS) if args.model == "all" else [args.model]
+    fmt = lambda ms: "-" if ms is None else f"{ms:,.0f}ms"  # noqa: E731
+    print(f"{'모형':<8}{'생물':>8}{'관계':>10}{'연결도':>10}  영양 단계(0~4)            "
+          f"{'생성':>8}{'해시':>8}{'시뮬':>8}{'피라미드':>8}{'배치':>9}{'그림':>9}")
+    for model in models:
+        for size in args.sizes:
+            r = bench(model, size, args.links, args.seed, args.draw_max)
+            print(f"{r['model']:<8}{r['species']:>8,}{r['relations']:>10,}{r['C']:>10.5f}  {str(r['levels']):<26}"
+                  f"{fmt(r['generate']):>8}{fmt(r['hash']):>8}{fmt(r['simulate']):>8}{fmt(r['pyramid']):>8}"
+                  f"{fmt(r['layout']):>9}{fmt(r['draw']):>9}")
+
+
+if __name__ == "__main__":
+    main()
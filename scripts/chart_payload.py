@@ -0,0 +1,57 @@
+"""그래프 이미지 전송량 비교: 예전 st.pyplot() PNG vs 현재 출력 형식(utils.charts.CHART_OUTPUT).
+
+페이지 1/2/3이 한 번 실행될 때 보내는 그래프 이미지의 바이트 수를 단순 모형(SIMPLE_ECO)과
+14종이 모두 들어간 먹이그물로 비교합니다. 예전 방식은 st.pyplot()의 기본값
+(PNG, dpi=200, 팔레트 없음)과 같게 그립니다.
+
+    python scripts/chart_payload.py
+"""
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.charts import ecosystem_spec, network_spec, pyramid_spec  # noqa: E402
+from utils.ecosystem import (  # noqa: E402
+    FULL_ECO, SIMPLE_ECO, SPECIES_TL, TL_COLORS, run_simulation_step_by_step, species_label,
+)
+from utils.render import SAVEFIG_OPTIONS, render_spec  # noqa: E402
+
+
+def page_specs(eco):
+    """페이지별로 한 번 실행할 때 그리는 그림 명세 목록."""
+    nodes, edges, pop = eco["nodes"], eco["edges"], eco["initial_population"]
+    after, initial, _ = run_simulation_step_by_step(eco, int(nodes[0]), "제거 (멸종)", 0)
+    tl_colors = [TL_COLORS[SPECIES_TL[n]] for n in nodes.tolist()]
+    labels = {n: species_label(n) for n in nodes.tolist()}
+    return {
+        "page1": [network_spec(nodes, edges, tl_colors, labels, "모형 시각화", figsize=(10, 8), columns=1,
+                               node_size=4000, arrowsize=30, width=2, fontsize=12, title_size=15)],
+        "page2": [
+            ecosystem_spec(nodes, edges, pop, "실험 전 (먹이그물)", pop),
+            pyramid_spec(pop, "실험 전 (생태 피라미드)"),
+            ecosystem_spec(nodes, edges, after, "실험 후 (먹이그물)", initial),
+            pyramid_spec(after, "실험 후 (생태 피라미드)"),
+        ],
+        "page3": [network_spec(nodes, edges, tl_colors, labels, "최종 모형", figsize=(5, 4), columns=1)],
+    }
+
+
+def legacy(spec):
+    """st.pyplot() 기본값으로 저장했을 때와 같은 명세."""
+    return {**spec, "format": "png", "dpi": SAVEFIG_OPTIONS["dpi"], "palette": None}
+
+
+def main():
+    logging.getLogger("matplotlib.font_manager").setLevel(logging.ERROR)
+    print(f"{'모형':<10}{'페이지':<8}{'예전(B)':>12}{'현재(B)':>12}{'비율':>8}")
+    for eco in (SIMPLE_ECO, FULL_ECO):
+        for page, specs in page_specs(eco).items():
+            before = sum(len(render_spec(legacy(s))) for s in specs)
+            after = sum(len(render_spec(s)) for s in specs)
+            print(f"{eco['name']:<10}{page:<8}{before:>12,}{after:>12,}{after / before:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
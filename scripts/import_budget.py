@@ -0,0 +1,97 @@
+"""페이지별 import 시간 예산 검사 (python -X importtime 기반).
+
+각 페이지 스크립트를 새 파이썬 프로세스에서 (Streamlit bare 모드로) 실행하면서
+`-X importtime` 출력을 모아, 페이지가 추가로 불러온 모듈의 누적 import 시간과
+스크립트 실행 시간을 보고합니다. streamlit 자체는 서버가 이미 불러 둔 상태이므로
+측정 전에 미리 import 해 둡니다.
+
+    python scripts/import_budget.py            # 보고서 출력, 예산 초과 시 종료 코드 1
+    python scripts/import_budget.py --repeat 5 # 5번 실행해 최솟값 사용
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# 페이지별 import 시간 예산 (밀리초, 빈 세션으로 처음 접속했을 때 기준)
+BUDGET_MS = {
+    "streamlit_app.py": 20,
+    "pages/page1.py": 200,    # numpy (세션 상태 배열) 포함
+    "pages/page2.py": 1200,   # 기본 모형 그래프를 바로 그리므로 matplotlib/networkx 포함
+    "pages/page3.py": 200,
+    "pages/page4.py": 200,    # numpy (격자 엔진), PIL은 실험을 시작할 때만
+}
+
+# 빈 세션에서 불러오면 안 되는 무거운 모듈 (그래프를 그릴 때만 지연 로딩)
+FORBIDDEN = {
+    "streamlit_app.py": ("networkx", "matplotlib", "numpy", "pandas"),
+    "pages/page1.py": ("networkx", "matplotlib"),
+    "pages/page3.py": ("networkx", "matplotlib"),
+    "pages/page4.py": ("networkx", "matplotlib", "PIL"),
+}
+
+MARKER = "@@page-start@@"
+
+_CHILD = f"""
+import runpy, sys, time
+import streamlit
+sys.stderr.write({MARKER!r} + "\\n"); sys.stderr.flush()
+t0 = time.perf_counter()
+runpy.run_path(sys.argv[1], run_name="__main__")
+sys.stderr.write("@@run-ms %.1f@@\\n" % ((time.perf_counter() - t0) * 1000))
+"""
+
+
+def measure(page):
+    """페이지를 한 번 실행해 (import 누적 ms, 실행 ms, 불러온 모듈 목록)을 돌려줍니다."""
+    # 백그라운드 워밍업이 import 측정을 오염시키지 않도록 끕니다.
+    env = dict(os.environ, PYTHONPATH=ROOT, ECO_WARM_UP="0")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD, os.path.join(ROOT, page)],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{page} 실행 실패:\n{proc.stderr[-2000:]}")
+
+    lines = proc.stderr.splitlines()
+    lines = lines[lines.index(MARKER) + 1:]
+    import_us, run_ms, modules = 0, 0.0, []
+    for line in lines:
+        if line.startswith("@@run-ms"):
+            run_ms = float(line.split()[1].rstrip("@"))
+        elif line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            modules.append(name.strip())
+            # 들여쓰기가 없는 줄이 페이지가 직접 일으킨 최상위 import 입니다.
+            # (streamlit 내부 모듈은 서버 프로세스가 한 번만 부담하므로 제외)
+            if not name[1:].startswith(" ") and not name.strip().startswith("streamlit"):
+                import_us += int(cumulative)
+    return import_us / 1000, run_ms, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="페이지별 반복 실행 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'page':<20} {'import ms':>10} {'budget':>8} {'run ms':>10}  heavy modules")
+    for page, budget in BUDGET_MS.items():
+        runs = [measure(page) for _ in range(args.repeat)]
+        import_ms = min(r[0] for r in runs)
+        run_ms = min(r[1] for r in runs)
+        modules = runs[0][2]
+        heavy = sorted({m.split(".")[0] for m in modules} & set(FORBIDDEN.get(page, ())))
+
+        over = import_ms > budget or heavy
+        failed |= bool(over)
+        flag = "  ❌" if over else ""
+        print(f"{page:<20} {import_ms:>10.1f} {budget:>8} {run_ms:>10.1f}  {', '.join(heavy) or '-'}{flag}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""워밍업 후 Streamlit 서버를 같은 프로세스에서 시작합니다.
+
+    python serve.py [streamlit run 옵션...]
+
+`streamlit run streamlit_app.py`와 같지만, 서버가 요청을 받기 전에
+utils.warmup.warm_up()을 실행해 폰트와 SIMPLE_ECO 그래프/실험 결과를
+프로세스 전체 캐시에 채워 둡니다. 그래서 배포 후 첫 학생도 데워진 서버를 만납니다.
+"""
+import logging
+import os
+import sys
+
+from streamlit.web import cli as stcli
+
+from utils.warmup import start_warm_up
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit_app.py")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    start_warm_up(background=False)
+    sys.argv = ["streamlit", "run", APP, *sys.argv[1:]]
+    sys.exit(stcli.main())
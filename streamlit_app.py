@@ -1,7 +1,9 @@
 import streamlit as st
-import base64
 from pathlib import Path
 
+from utils.fonts import build_nanum_font_css
+from utils.warmup import start_warm_up
+
 # --- 1. 페이지 기본 설정 ---
 # 이 설정은 앱의 모든 페이지에 적용됩니다. (가장 먼저 호출되어야 함)
 st.set_page_config(
@@ -29,33 +31,8 @@ def inject_nanum_font():
         return
 
     try:
-        # 폰트 파일을 base64로 인코딩
-        b64 = base64.b64encode(font_path.read_bytes()).decode("utf-8")
-        
-        # CSS 스타일 정의
-        css = f"""
-        <style>
-        @font-face {{
-            font-family: 'NanumGothicLocal';
-            src: url('data:font/ttf;base64,{b64}') format('truetype');
-            font-weight: normal;
-            font-style: normal;
-            font-display: swap;
-        }}
-        
-        /* Streamlit의 모든 UI 요소에 폰트 적용 */
-        html, body, .stApp, [class*="css"] {{
-            font-family: 'NanumGothicLocal', 'NanumGothic', sans-serif !important;
-        }}
-        
-        /* 헤더, 마크다운 텍스트 등에도 명시적으로 적용 */
-        h1, h2, h3, h4, h5, h6, .stMarkdown {{
-            font-family: 'NanumGothicLocal', 'NanumGothic', sans-serif !important;
-        }}
-        </style>
-        """
         # CSS 주입
-        st.markdown(css, unsafe_allow_html=True)
+        st.markdown(build_nanum_font_css(), unsafe_allow_html=True)
     
     except Exception as e:
         st.error(f"폰트 주입 중 오류 발생: {e}")
@@ -66,6 +43,7 @@ def main_home_page():
     
     # 1. 폰트 주입 실행
     inject_nanum_font()
+    start_warm_up()
 
     # 2. 메인 타이틀 및 소개
     st.title("🌳 살아있는 생태계 학습 교실 👩‍🔬")
@@ -80,6 +58,7 @@ def main_home_page():
         1.  **[1. 먹이 관계 모형 만들기]**: 직접 생물 카드를 골라 나만의 먹이그물을 만들어봅니다.
         2.  **[2. 생태계 안정성 실험]**: 만든 먹이그물에 충격을 주어 생태 피라미드가 어떻게 변하는지 실험합니다.
         3.  **[3. 모형 완성 확인 및 퀴즈]**: 완성된 모형의 복잡도를 확인하고, 핵심 개념 퀴즈를 풀어봅니다.
+        4.  **[4. 공간 생태계 실험]**: 먹이그물의 생물들을 넓은 땅(격자)에 퍼뜨리고, 한 곳에서 생물이 사라진 영향이 어떻게 번지는지 관찰합니다.
         """
     )
     
@@ -109,7 +88,8 @@ def main_home_page():
 ├── 📁 pages/
 │   ├── 📄 1_먹이관계_모형.py (page 1 코드)
 │   ├── 📄 2_생태계_안정성_실험.py (page 2 코드)
-│   └── 📄 3_개념_퀴즈.py (page 3 코드)
+│   ├── 📄 3_개념_퀴즈.py (page 3 코드)
+│   └── 📄 4_공간_생태계_실험.py (page 4 코드)
 │
 └── 📁 fonts/
     └── 📄 NanumGothic.ttf (한글 폰트 파일)
@@ -0,0 +1,82 @@
+"""학생 먹이그물 일괄 평가 도구 (Streamlit 없이 실행).
+
+페이지 1/3에서 내려받은 모형 JSON 파일이 모인 폴더를 받아, 모든 모형을
+프로세스 풀로 병렬 평가하고 결과를 열 기반 파일(Parquet 또는 CSV)로 저장합니다.
+
+    python -m utils.batch exported_webs/ -o results.parquet
+    python -m utils.batch exported_webs/ -o results.csv --workers 4
+
+결과 열: file, student, name, species, relations, chain_complete, stability_score,
+mean_population_loss, max_population_loss, mean_species_hit, keystone_species, error
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from utils.ecosystem import ecosystem_from_dict, evaluate_ecosystem
+
+RESULT_COLUMNS = (
+    "file", "student", "name", "species", "relations", "chain_complete", "stability_score",
+    "mean_population_loss", "max_population_loss", "mean_species_hit", "keystone_species", "error",
+)
+
+
+def evaluate_file(path):
+    """JSON 파일 하나를 평가해 결과 행(dict)을 돌려줍니다. 실패하면 error 열에 사유를 남깁니다."""
+    row = dict.fromkeys(RESULT_COLUMNS)
+    row["file"] = os.path.basename(path)
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        ecosystem_data = ecosystem_from_dict(data)
+        row["student"] = data.get("student")
+        row.update(evaluate_ecosystem(ecosystem_data))
+    except Exception as e:
+        # 잘못된 파일 하나 때문에 일괄 평가 전체가 멈추지 않도록, 어떤 오류든 그 행에만 기록합니다.
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def evaluate_directory(directory, workers=None, chunksize=256):
+    """폴더 안의 모든 *.json 모형을 병렬로 평가해 결과 행 목록을 돌려줍니다."""
+    paths = sorted(str(p) for p in Path(directory).glob("*.json"))
+    if workers == 1:
+        return [evaluate_file(p) for p in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(evaluate_file, paths, chunksize=chunksize))
+
+
+def write_results(rows, output):
+    """결과를 열 기반 파일로 저장합니다. 확장자가 .csv면 CSV, 그 외에는 Parquet."""
+    import pandas as pd
+
+    df = pd.DataFrame(rows, columns=list(RESULT_COLUMNS))
+    if str(output).endswith(".csv"):
+        df.to_csv(output, index=False, encoding="utf-8-sig")  # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+    else:
+        df.to_parquet(output, index=False)
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="학생 먹이그물 JSON을 일괄 평가합니다.")
+    parser.add_argument("directory", help="내보낸 모형 JSON 파일이 들어 있는 폴더")
+    parser.add_argument("-o", "--output", default="results.parquet", help="결과 파일 (.parquet 또는 .csv)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    rows = evaluate_directory(args.directory, workers=args.workers)
+    write_results(rows, args.output)
+    elapsed = max(time.perf_counter() - t0, 1e-9)
+
+    failed = sum(1 for r in rows if r["error"])
+    print(f"{len(rows)}개 모형 평가 완료 ({elapsed:.1f}초, 분당 {len(rows) / elapsed * 60:,.0f}개), 실패 {failed}개 -> {args.output}")
+    return 1 if failed and failed == len(rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
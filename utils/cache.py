@@ -0,0 +1,226 @@
+"""서버 프로세스 전체에서 공유하는 캐시.
+
+utils 모듈은 페이지가 다시 실행돼도 sys.modules에 남아 있으므로, 이 모듈의
+캐시는 모든 학생 세션이 함께 씁니다. 키는 모형의 정규형 내용 해시
+(utils.ecosystem.ecosystem_hash / web_hash)라서, 생물과 화살표를 추가한 순서가
+달라도 같은 먹이그물이면 같은 결과를 꺼내 씁니다. 기본 모형(SIMPLE_ECO)으로
+시작하는 대부분의 학생은 워밍업(utils.warmup)이 미리 채워 둔 결과를 그대로 씁니다.
+
+- 각 캐시는 항목 수(와 선택적으로 바이트 수)로 크기가 제한된 LRU입니다.
+- 적중/실패/퇴출 횟수를 세며, cache_stats()로 모니터링할 수 있습니다.
+- ECO_RESULT_STORE가 설정돼 있으면 시뮬레이션/이미지 캐시 뒤에 SQLite 저장소
+  (utils.store)가 붙어, 재배포 후에도 결과가 남습니다.
+- 돌려주는 배열은 세션끼리 공유되므로 읽기 전용입니다.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.ecosystem import (
+    SPECIES_TL, canonical_ecosystem, ecosystem_hash, run_simulation_step_by_step, shock_key, web_hash,
+)
+from utils.store import get_result_store
+
+
+def _sizeof(value):
+    """캐시 항목의 대략적인 바이트 수 (배열, 바이트/문자열, 그 묶음)."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(_sizeof(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_sizeof(v) for v in value.values())
+    return 64
+
+
+class LRUCache:
+    """스레드 안전한 크기 제한 LRU 캐시. 적중/실패 횟수를 셉니다.
+
+    store(utils.store.ResultStore)를 주면 메모리에 없는 키를 저장소에서 찾고,
+    새로 넣은 값은 저장소에 비동기로 씁니다. 이때 키는 문자열이어야 합니다.
+    """
+
+    def __init__(self, name, max_entries, max_bytes=None, sizeof=_sizeof, store=None):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.store = store
+        self._sizeof = sizeof
+        self._data = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.store_hits = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+        if item is not None:
+            if self.store is not None:
+                self.store.touch(self.name, key)
+            return item[0]
+
+        if self.store is not None:
+            value = self.store.get(self.name, key)
+            if value is not None:
+                self.store_hits += 1
+                self.put(key, value, persist=False)
+                return value
+        return default
+
+    def put(self, key, value, persist=True):
+        if persist and self.store is not None:
+            self.store.put(self.name, key, value)
+        size = self._sizeof(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (value, size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes and len(self._data) > 1
+            ):
+                _, (_, evicted_size) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """키가 있으면 꺼내고, 없으면 compute()로 만들어 넣은 뒤 돌려줍니다."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def get_many(self, keys):
+        """여러 키를 한 번에 찾아 ({찾은 키: 값}, [없는 키]) 를 돌려줍니다."""
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                item = self._data.get(key)
+                if item is None:
+                    self.misses += 1
+                    missing.append(key)
+                else:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    found[key] = item[0]
+        if self.store is not None:
+            for key in found:
+                self.store.touch(self.name, key)
+            if missing:
+                stored = self.store.get_many(self.name, missing)
+                self.store_hits += len(stored)
+                for key, value in stored.items():
+                    self.put(key, value, persist=False)
+                found.update(stored)
+                missing = [key for key in missing if key not in stored]
+        return found, missing
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "store_hits": self.store_hits,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# 프로세스 전체에서 공유하는 캐시들 (이미지 캐시는 utils.charts에 있음)
+SIMULATION_CACHE = LRUCache("simulation", max_entries=4096, store=get_result_store())
+LAYOUT_CACHE = LRUCache("layout", max_entries=1024)
+_CACHES = [SIMULATION_CACHE, LAYOUT_CACHE]
+
+
+def register_cache(cache):
+    """cache_stats()에 포함할 캐시를 등록합니다."""
+    _CACHES.append(cache)
+    return cache
+
+
+def cache_stats():
+    """등록된 모든 공유 캐시의 통계 목록."""
+    return [cache.stats() for cache in _CACHES]
+
+
+def _freeze(*arrays):
+    for arr in arrays:
+        arr.flags.writeable = False
+    return arrays
+
+
+def cached_simulation(ecosystem_data, change_target, change_type, change_value):
+    """run_simulation_step_by_step()의 결과를 세션 사이에서 공유합니다.
+
+    정규형 모형으로 계산하므로 로그는 생물 ID 순서로 나옵니다. (개체수 결과는 순서와 무관)
+    같은 순서를 보여 주려면 단계별 경로(iter_simulation_steps)에도 canonical_ecosystem()을 넘기세요.
+    """
+    shock = shock_key(change_target, change_type, change_value)
+    return SIMULATION_CACHE.get_or_compute(
+        ":".join(map(str, (ecosystem_hash(ecosystem_data), *shock))),
+        lambda: _freeze(*run_simulation_step_by_step(canonical_ecosystem(ecosystem_data), *shock)),
+    )
+
+
+# networkx spring_layout은 이 생물 수부터 scipy(희소 행렬)가 필요하고 느려지므로, 영양 단계 배치를 씁니다.
+SPRING_MAX_NODES = 500
+
+
+def trophic_layout(nodes, species_tl=SPECIES_TL):
+    """영양 단계별 배치 좌표. 생산자가 맨 아래, 같은 단계의 생물은 ID 순서로 가로로 고르게 놓입니다."""
+    nodes = np.asarray(nodes)
+    tl = np.asarray(species_tl)[nodes]
+    order = np.lexsort((nodes, tl))
+    counts = np.bincount(tl, minlength=5)
+    starts = np.cumsum(counts) - counts
+    rank = np.empty(len(nodes), dtype=np.int64)
+    rank[order] = np.arange(len(nodes)) - starts[tl[order]]
+    xy = np.column_stack([(rank + 0.5) / counts[tl] * 2 - 1, tl / 2 - 1])
+    return dict(zip(nodes.tolist(), xy))
+
+
+def cached_layout(nodes, edges, species_tl=SPECIES_TL):
+    """먹이그물의 배치 좌표를 계산합니다. (정규형 + seed 고정이라 결과가 항상 같음)
+
+    SPRING_MAX_NODES종 미만이면 spring layout, 그 이상(합성 먹이그물)이면 trophic_layout입니다.
+    """
+    canonical = canonical_ecosystem({"nodes": nodes, "edges": edges})
+    key = web_hash(canonical["nodes"], canonical["edges"])
+    if len(nodes) >= SPRING_MAX_NODES:
+        return LAYOUT_CACHE.get_or_compute(f"tl:{key}", lambda: trophic_layout(canonical["nodes"], species_tl))
+
+    def compute():
+        import networkx as nx
+
+        G = nx.DiGraph()
+        G.add_nodes_from(canonical["nodes"].tolist())
+        G.add_edges_from(canonical["edges"].tolist())
+        return nx.spring_layout(G, seed=42, k=0.5)
+
+    return LAYOUT_CACHE.get_or_compute(key, compute)
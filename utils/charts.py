@@ -0,0 +1,188 @@
+"""그래프(먹이그물, 생태 피라미드)의 그림 명세를 만들고 이미지로 렌더링합니다.
+
+그래프는 먼저 그림 명세(spec)로 만든 뒤 렌더링 워커 풀(utils.render_pool)에서
+이미지로 그립니다. 입력 값이 같으면 결과 이미지도 같으므로 이미지는 명세의
+내용 해시를 키로 프로세스 전체에서 캐시합니다. 페이지에서는 st.image()로 표시합니다.
+
+이미지 형식과 해상도는 그래프 종류별로 CHART_OUTPUT에서 정합니다. 해상도(dpi)는
+화면에 실제로 보이는 칸 너비에 맞춰 계산하므로, 쓸데없이 큰 이미지를 보내지 않습니다.
+형식과 dpi도 명세에 들어가므로 캐시 키가 형식별로 달라집니다.
+
+애니메이션은 animation_specs()가 프레임 명세를 하나씩 만들고, stream_figures()가
+그려지는 대로 한 장씩 페이지에 넘겨 줍니다.
+"""
+import hashlib
+import itertools
+import math
+import pickle
+from collections import deque
+
+from utils.cache import LRUCache, cached_layout, register_cache
+from utils.store import get_result_store
+from utils.ecosystem import (
+    SPECIES_TL, TL_COLORS, TL_ORDER, canonical_ecosystem, get_trophic_level_populations, species_label,
+)
+from utils.render_pool import get_render_pool
+
+# 렌더링된 이미지 캐시 (명세 해시 -> 이미지), 오래 안 쓴 것부터 버림
+IMAGE_CACHE = register_cache(
+    LRUCache("images", max_entries=2048, max_bytes=128 * 2**20, store=get_result_store())
+)
+
+# 그래프 종류별 출력 형식. format은 "png" 또는 "svg", palette는 팔레트 PNG의 색 수.
+# (14종 먹이그물 기준 먹이그물 168KB -> 36KB, 피라미드 35KB -> 7.5KB. SVG 피라미드는 42KB)
+CHART_OUTPUT = {
+    "network": {"format": "png", "palette": 64},
+    "pyramid": {"format": "png", "palette": 32},
+}
+
+# 화면 크기 가정: wide 레이아웃 본문 너비(CSS 픽셀)와 화면 배율.
+# 이보다 큰 이미지는 브라우저에서 줄여 보일 뿐이고, 1460px을 넘으면 Streamlit이 다시 인코딩합니다.
+CONTENT_WIDTH_PX = 960
+PIXEL_RATIO = 1.5
+
+
+def chart_dpi(figsize, columns=1):
+    """그림이 st.columns(columns) 한 칸을 채울 때 화면 픽셀과 맞는 dpi."""
+    return math.ceil(CONTENT_WIDTH_PX / columns * PIXEL_RATIO / figsize[0])
+
+
+def output_options(kind, figsize, columns):
+    """명세에 넣을 출력 형식 값 (format, dpi, palette)."""
+    return {**CHART_OUTPUT[kind], "dpi": chart_dpi(figsize, columns)}
+
+
+# 1. 네트워크 그래프
+def network_spec(nodes, edges, colors, labels, title, figsize=(5, 4), columns=2,
+                 node_size=2000, arrowsize=20, width=1.5, fontsize=8, title_size=12, species_tl=SPECIES_TL):
+    """먹이그물(네트워크)의 그림 명세. 배치는 모든 세션이 공유하는 cached_layout을 씁니다.
+
+    colors는 nodes와 같은 순서입니다. 명세는 정규형(생물 ID 순) 순서로 만들어서
+    같은 먹이그물이면 추가한 순서와 관계없이 같은 이미지 캐시 키가 나옵니다.
+    species_tl은 큰 먹이그물(합성 먹이그물)의 영양 단계 배치에 씁니다.
+    """
+    canonical = canonical_ecosystem({"nodes": nodes, "edges": edges})
+    color_of = dict(zip(nodes.tolist(), colors))
+    order = canonical["nodes"].tolist()
+    pos = cached_layout(nodes, edges, species_tl)
+    return {
+        "kind": "network",
+        "figsize": figsize,
+        "nodes": order,
+        "edges": canonical["edges"].tolist(),
+        "pos": {n: tuple(map(float, pos[n])) for n in order},
+        "colors": [color_of[n] for n in order],
+        "labels": {n: labels[n] for n in order},
+        "node_size": node_size, "arrowsize": arrowsize, "width": width,
+        "fontsize": fontsize, "title_size": title_size,
+        "title": title,
+        **output_options("network", figsize, columns),
+    }
+
+
+def _population_style(nodes, population, initial_pop):
+    """개체 수 변화에 따른 노드 색상(증가 초록, 감소 빨강)과 개체 수가 붙은 이름표."""
+    colors = []
+    for node in nodes.tolist():
+        change = population[node] - initial_pop[node]
+        if change > 0: colors.append('lightgreen')
+        elif change < 0: colors.append('red')
+        else: colors.append('skyblue')
+
+    labels = {node: f"{species_label(node)}\n({population[node]})" for node in nodes.tolist()}
+    return colors, labels
+
+
+def ecosystem_spec(nodes, edges, population, title, initial_pop):
+    """페이지 2의 먹이그물 명세. 개체 수 변화를 노드 색상으로 표현합니다."""
+    colors, labels = _population_style(nodes, population, initial_pop)
+    # --- [수정] 그래프 크기 줄이기 (10, 8) -> (5, 4) ---
+    return network_spec(nodes, edges, colors, labels, title, figsize=(5, 4), columns=2)
+
+
+def animation_specs(nodes, edges, initial_pop, steps):
+    """충격이 먹이그물을 따라 퍼지는 애니메이션의 프레임 명세를 하나씩 만드는 제너레이터.
+
+    steps는 utils.ecosystem.iter_simulation_steps()처럼 (개체수 벡터, 로그 레코드)를
+    내어 주는 반복자입니다. 배치(레이아웃)와 정규형은 첫 프레임에서 한 번만 계산하고,
+    이후 프레임은 색상/이름표/제목만 바꿉니다. (명세, 로그 레코드)를 내어 주며,
+    첫 프레임(실험 전)의 로그 레코드는 None입니다.
+    """
+    base = ecosystem_spec(nodes, edges, initial_pop, "0단계: 실험 전", initial_pop)
+    yield base, None
+    order = base["nodes"]
+    for i, (population, record) in enumerate(steps, start=1):
+        colors, labels = _population_style(nodes, population, initial_pop)
+        color_of = dict(zip(nodes.tolist(), colors))
+        yield {
+            **base,
+            "colors": [color_of[n] for n in order],
+            "labels": {n: labels[n] for n in order},
+            "title": f"{i}단계",
+        }, record
+
+
+# 2. 생태 피라미드 그래프
+def pyramid_spec(population, title, species_tl=SPECIES_TL):
+    """영양 단계별 개체수로 만든 생태 피라미드의 그림 명세. (합성 먹이그물은 species_tl을 함께 넘김)"""
+    tl_pops = get_trophic_level_populations(population, species_tl)
+    figsize = (5, 3)  # --- [수정] 그래프 크기 줄이기 (10, 6) -> (5, 3) ---
+    return {
+        "kind": "pyramid",
+        "figsize": figsize,
+        "labels": TL_ORDER,
+        "values": [tl_pops[tl] for tl in TL_ORDER],
+        "colors": TL_COLORS,
+        "xlabel": "개체 수",
+        "title": title,
+        **output_options("pyramid", figsize, columns=2),
+    }
+
+
+def spec_key(spec):
+    return hashlib.sha1(pickle.dumps(spec, protocol=4)).hexdigest()
+
+
+def stream_figures(items, lookahead=2):
+    """(명세, 꼬리표) 반복자를 받아 (꼬리표, 이미지)를 순서대로 하나씩 내어 주는 제너레이터.
+
+    워커 풀이 있으면 지금 프레임을 내어 주기 전에 다음 lookahead장을 미리 제출해,
+    페이지가 한 장을 보여 주는 동안 다음 장이 그려집니다. 들고 있는 것은 앞서 제출한
+    몇 장뿐이라 애니메이션 전체를 메모리에 쌓지 않습니다. (워커가 없으면 한 장씩 그림)
+
+    애니메이션 프레임은 한 번 보고 마는 그림이라 공유 이미지 캐시(IMAGE_CACHE)와
+    결과 저장소를 거치지 않습니다. (자주 쓰는 그래프가 프레임에 밀려나지 않도록)
+    """
+    pool = get_render_pool()
+    if pool.workers <= 0:
+        lookahead = 0
+    items = iter(items)
+    pending = deque()  # (명세, 꼬리표, Future)
+
+    def submit_next():
+        for spec, tag in itertools.islice(items, lookahead + 1 - len(pending)):
+            pending.append((spec, tag, pool.submit(spec)))
+
+    submit_next()
+    while pending:
+        spec, tag, future = pending.popleft()
+        image = pool.result(spec, future)
+        if lookahead:
+            submit_next()
+        yield tag, image
+        if not lookahead:
+            submit_next()
+
+
+def render_figures(specs):
+    """명세 목록을 이미지 목록으로 렌더링합니다. 캐시에 없는 것만 워커 풀에 동시에 보냅니다."""
+    keys = [spec_key(spec) for spec in specs]
+    found, missing = IMAGE_CACHE.get_many(dict.fromkeys(keys))
+
+    if missing:
+        specs_by_key = dict(zip(keys, specs))
+        rendered = get_render_pool().render_many([specs_by_key[key] for key in missing])
+        for key, image in zip(missing, rendered):
+            IMAGE_CACHE.put(key, image)
+            found[key] = image
+    return [found[key] for key in keys]
@@ -0,0 +1,415 @@
+"""생태계 공통 데이터와 시뮬레이션 핵심 로직 (Streamlit 없이 import 가능한 엔진).
+
+모든 페이지가 같은 생물 카탈로그를 공유하도록 한 곳에 모아 둡니다.
+생물은 카탈로그 안의 정수 ID(0~13)로 다루고, 개체수는 ID로 인덱싱되는
+numpy 벡터로 저장합니다. 이름 문자열은 화면에 표시할 때만 꺼내 씁니다.
+
+이 모듈은 UI 코드를 실행하지 않으므로 일괄 평가 도구(utils.batch)나
+다른 스크립트에서도 그대로 불러 쓸 수 있습니다.
+"""
+import hashlib
+import json
+
+import numpy as np
+
+# --- 1. 생물 카탈로그 ---
+
+# 14종의 생물 데이터 (생물, 이모지, 영양 단계)
+ECO_DATA = {
+    "풀/나무": {"emoji": "🌳", "tl": "생산자"}, "도토리": {"emoji": "🌰", "tl": "생산자"},
+    "산수유": {"emoji": "🍒", "tl": "생산자"}, "메뚜기": {"emoji": "🦗", "tl": "1차 소비자"},
+    "토끼": {"emoji": "🐇", "tl": "1차 소비자"}, "애벌레": {"emoji": "🐛", "tl": "1차 소비자"},
+    "다람쥐": {"emoji": "🐿️", "tl": "1차 소비자"}, "오리": {"emoji": "🦆", "tl": "2차 소비자"},
+    "개구리": {"emoji": "🐸", "tl": "2차 소비자"}, "직박구리": {"emoji": "🐦", "tl": "2차 소비자"},
+    "뱀": {"emoji": "🐍", "tl": "3차 소비자"}, "족제비": {"emoji": "🦦", "tl": "3차 소비자"},
+    "여우": {"emoji": "🦊", "tl": "3차 소비자"}, "매": {"emoji": "🦅", "tl": "최종 소비자"}
+}
+
+TL_ORDER = ["생산자", "1차 소비자", "2차 소비자", "3차 소비자", "최종 소비자"]
+TL_MAP_KOR = {
+    "생산자": "🌿 생산자", "1차 소비자": "🥕 1차 소비자",
+    "2차 소비자": "🐸 2차 소비자", "3차 소비자": "🐍 3차 소비자",
+    "최종 소비자": "👑 최종 소비자"
+}
+TL_COLORS = ['lightgreen', 'yellow', 'orange', 'salmon', 'red']
+INITIAL_POP = 50
+
+# 정수 ID <-> 이름 매핑 (ID는 ECO_DATA의 순서)
+SPECIES_NAMES = tuple(ECO_DATA)
+SPECIES_ID = {name: i for i, name in enumerate(SPECIES_NAMES)}
+SPECIES_EMOJI = {name: info["emoji"] for name, info in ECO_DATA.items()}
+NUM_SPECIES = len(SPECIES_NAMES)
+
+# ID별 영양 단계 인덱스 (TL_ORDER 기준)
+SPECIES_TL = np.array([TL_ORDER.index(ECO_DATA[n]["tl"]) for n in SPECIES_NAMES], dtype=np.int8)
+
+# 세션 상태에서 쓰는 압축 자료형
+ID_DTYPE = np.int8      # 생물 ID (카탈로그가 127종을 넘으면 int16으로 올릴 것)
+POP_DTYPE = np.int32    # 개체수
+
+
+def species_label(sid):
+    """생물 ID를 '이모지 이름' 형태의 표시용 문자열로 바꿉니다."""
+    name = SPECIES_NAMES[sid]
+    return f"{SPECIES_EMOJI[name]} {name}"
+
+
+def empty_population():
+    """카탈로그 크기의 0 개체수 벡터를 만듭니다."""
+    return np.zeros(NUM_SPECIES, dtype=POP_DTYPE)
+
+
+def compact_ecosystem(name, nodes, edges, initial_population, removal_factor=0.4):
+    """이름 기반 생태계 정의를 ID 배열 기반의 압축 형태로 변환합니다."""
+    pop = empty_population()
+    for species, count in initial_population.items():
+        pop[SPECIES_ID[species]] = count
+    return {
+        "name": name,
+        "nodes": np.array([SPECIES_ID[n] for n in nodes], dtype=ID_DTYPE),
+        "edges": np.array([(SPECIES_ID[a], SPECIES_ID[b]) for a, b in edges], dtype=ID_DTYPE).reshape(-1, 2),
+        "initial_population": pop,
+        "removal_factor": removal_factor,
+    }
+
+
+SIMPLE_ECO = compact_ecosystem(
+    "단순한 먹이사슬",
+    nodes=["풀/나무", "토끼", "뱀"],
+    edges=[("풀/나무", "토끼"), ("토끼", "뱀")],
+    initial_population={"풀/나무": 100, "토끼": 50, "뱀": 20},
+    removal_factor=0.5,
+)
+
+# 카탈로그 14종을 모두 넣고, 영양 단계가 바로 하나 위인 생물을 모두 이은 먹이그물
+# (scripts/의 벤치마크와 그래프 전송량 측정에서 "큰 모형"으로 씀)
+FULL_ECO = compact_ecosystem(
+    "전체 14종",
+    nodes=list(ECO_DATA),
+    edges=[(a, b) for a in ECO_DATA for b in ECO_DATA
+           if TL_ORDER.index(ECO_DATA[b]["tl"]) == TL_ORDER.index(ECO_DATA[a]["tl"]) + 1],
+    initial_population={name: INITIAL_POP for name in ECO_DATA},
+)
+
+# --- 2. 시뮬레이션 로그 (구조화된 기록) ---
+# 로그는 문자열 대신 (종류, 대상, 상대, 값1, 값2) 레코드로 저장하고,
+# 화면에 보여줄 때만 format_log_record()로 문장을 만듭니다.
+
+LOG_DTYPE = np.dtype([
+    ("kind", np.uint8), ("target", np.int32), ("other", np.int32),
+    ("a", np.int32), ("b", np.int32),
+])
+
+LOG_ALREADY_ZERO, LOG_REMOVED, LOG_INCREASED, LOG_DECREASED, LOG_PREDATOR_DROP, LOG_PREY_RISE = range(6)
+
+_LOG_TEMPLATES = {
+    LOG_ALREADY_ZERO: "⚠️ **{target}**는 이미 0마리입니다. 충격을 줄 수 없습니다.",
+    LOG_REMOVED: "🔴 **{target}** 카드 **제거**! (개체수: {a} → 0)",
+    LOG_INCREASED: "🟢 **{target}** 개체수 **증가**! ({a} → {b})",
+    LOG_DECREASED: "🟠 **{target}** 개체수 **감소**! ({a} → {b})",
+    LOG_PREDATOR_DROP: "📉 **{target}**의 먹이 감소로 **{other}**의 개체수가 **-{a} 감소**했어요.",
+    LOG_PREY_RISE: "📈 **{target}** 포식자 감소로 **{other}**의 개체수가 **+{a} 증가**했어요!",
+}
+
+
+def format_log_record(record, names=SPECIES_NAMES):
+    """구조화된 로그 레코드 하나를 마크다운 문장으로 만듭니다.
+
+    record는 LOG_DTYPE 배열의 원소이거나, iter_simulation_steps()가 내어 주는 튜플입니다.
+    """
+    if isinstance(record, tuple):
+        record = np.array(record, dtype=LOG_DTYPE)
+    other = names[record["other"]] if record["other"] >= 0 else ""
+    return _LOG_TEMPLATES[int(record["kind"])].format(
+        target=names[record["target"]], other=other, a=int(record["a"]), b=int(record["b"])
+    )
+
+
+# --- 3. 시뮬레이션 핵심 로직 ---
+
+def iter_simulation_steps(ecosystem_data, change_target, change_type, change_value):
+    """run_simulation_step_by_step()의 계산을 한 단계씩 내어 주는 제너레이터.
+
+    로그 레코드가 하나 생길 때마다 (개체수 벡터, 로그 레코드 튜플)을 내어 줍니다.
+    개체수 벡터는 다음 단계에서 그대로 고쳐 쓰는 작업 배열이므로, 보관하려면 복사하세요.
+    (애니메이션은 단계마다 그림 명세만 만들고 넘어가므로 전체 단계를 메모리에 쌓지 않습니다.)
+    """
+    edges = ecosystem_data["edges"]
+    population = ecosystem_data["initial_population"].copy()
+    removal_factor = ecosystem_data.get("removal_factor", 0.4)
+
+    # 1. 초기 충격 적용
+    original_pop = int(population[change_target])
+    pop_change_amount = 0
+
+    if original_pop == 0:
+        yield population, (LOG_ALREADY_ZERO, change_target, -1, 0, 0)
+        return
+
+    if change_type == "제거 (멸종)":
+        pop_change_amount = -original_pop
+        population[change_target] = 0
+        yield population, (LOG_REMOVED, change_target, -1, original_pop, 0)
+    else:
+        pop_change = int(original_pop * (change_value / 100))
+        population[change_target] = max(0, original_pop + pop_change)
+        pop_change_amount = int(population[change_target]) - original_pop
+
+        kind = LOG_INCREASED if pop_change_amount > 0 else LOG_DECREASED
+        yield population, (kind, change_target, -1, original_pop, int(population[change_target]))
+
+    # 2. 연쇄 반응 시뮬레이션 (간선은 [먹이, 포식자] 순서)
+    if pop_change_amount < 0:
+        target_gone = population[change_target] == 0
+
+        for predator in edges[edges[:, 0] == change_target, 1]:
+            decrease_factor = removal_factor if target_gone else 0.5
+            pop_decrease = int(population[predator] * decrease_factor)
+            population[predator] -= min(pop_decrease, int(population[predator]))
+            yield population, (LOG_PREDATOR_DROP, change_target, predator, pop_decrease, 0)
+
+        for prey in edges[edges[:, 1] == change_target, 0]:
+            increase_factor = removal_factor * 1.5 if target_gone else 0.5
+            pop_increase = int(population[prey] * increase_factor)
+            population[prey] += pop_increase
+            yield population, (LOG_PREY_RISE, change_target, prey, pop_increase, 0)
+
+
+def run_simulation_step_by_step(ecosystem_data, change_target, change_type, change_value):
+    """특정 생물의 개체 수 변화에 따른 생태계 반응을 시뮬레이션합니다.
+
+    ecosystem_data는 compact_ecosystem() 형태(ID 배열 + 개체수 벡터)이고,
+    change_target은 생물 ID입니다. (새 개체수 벡터, 초기 개체수 벡터, 로그 레코드 배열)을 돌려줍니다.
+    """
+    initial_pop_copy = ecosystem_data["initial_population"].copy()
+    simulation_log = []
+    for population, record in iter_simulation_steps(ecosystem_data, change_target, change_type, change_value):
+        simulation_log.append(record)
+    return population, initial_pop_copy, np.array(simulation_log, dtype=LOG_DTYPE)
+
+
+# --- 4. 피라미드 데이터 계산 함수 ---
+
+def get_trophic_level_populations(population, species_tl=SPECIES_TL):
+    """ID별 개체수 벡터를 영양 단계별 총 개체수로 합산합니다."""
+    totals = np.bincount(species_tl, weights=population, minlength=len(TL_ORDER))
+    return {tl: int(totals[i]) for i, tl in enumerate(TL_ORDER)}
+
+
+# --- 5. 모형 평가 (먹이사슬 완성, 복잡도, 충격 결과) ---
+
+# 완전한 먹이사슬: 생산자 -> 1차 -> 2차 -> 최종 소비자 (TL_ORDER 인덱스)
+FULL_CHAIN_LEVELS = (0, 1, 2, 4)
+
+
+def check_for_full_chain(edges, species_tl=SPECIES_TL):
+    """생산자 -> 1차 -> 2차 -> 최종 소비자의 완전한 체인이 있는지 확인합니다.
+
+    edges는 [먹이, 포식자] ID 배열입니다. 각 단계에서 도달 가능한 생물 집합을
+    불리언 벡터로 넓혀 가며, 마지막 단계까지 닿는 경로가 하나라도 있으면 True.
+    """
+    if len(edges) == 0:
+        return False
+    prey, predator = edges[:, 0], edges[:, 1]
+    reached = np.zeros(len(species_tl), dtype=bool)
+    reached[prey[species_tl[prey] == FULL_CHAIN_LEVELS[0]]] = True
+
+    for level in FULL_CHAIN_LEVELS[1:]:
+        step = reached[prey] & (species_tl[predator] == level)
+        if not step.any():
+            return False
+        reached[:] = False
+        reached[predator[step]] = True
+    return True
+
+
+def stability_score(nodes, edges):
+    """모형 복잡도 점수: 생물 한 종당 먹이 관계(화살표) 수."""
+    return len(edges) / len(nodes) if len(nodes) > 0 else 0
+
+
+def evaluate_ecosystem(ecosystem_data, species_tl=SPECIES_TL, names=SPECIES_NAMES):
+    """모형 하나를 평가해 먹이사슬 완성 여부, 복잡도, 멸종 충격 결과를 요약합니다.
+
+    모형의 모든 생물에 대해 한 번씩 '제거 (멸종)' 충격을 주고,
+    - 전체 개체수 감소율의 평균/최댓값
+    - 충격으로 개체수가 줄어든 다른 생물 수의 평균
+    - 가장 큰 피해를 준 (핵심) 생물
+    을 계산합니다.
+    """
+    nodes, edges = ecosystem_data["nodes"], ecosystem_data["edges"]
+    initial_total = int(ecosystem_data["initial_population"].sum())
+
+    losses, hits = [], []
+    for target in nodes.tolist():
+        new_pop, initial_pop, _ = run_simulation_step_by_step(ecosystem_data, target, "제거 (멸종)", 0)
+        losses.append(1 - new_pop.sum() / initial_total if initial_total else 0.0)
+        decreased = new_pop < initial_pop
+        decreased[target] = False
+        hits.append(int(decreased.sum()))
+
+    worst = int(np.argmax(losses)) if losses else -1
+    return {
+        "name": ecosystem_data.get("name", ""),
+        "species": int(len(nodes)),
+        "relations": int(len(edges)),
+        "chain_complete": check_for_full_chain(edges, species_tl),
+        "stability_score": stability_score(nodes, edges),
+        "mean_population_loss": float(np.mean(losses)) if losses else 0.0,
+        "max_population_loss": float(losses[worst]) if losses else 0.0,
+        "mean_species_hit": float(np.mean(hits)) if hits else 0.0,
+        "keystone_species": names[nodes[worst]] if losses else "",
+    }
+
+
+# --- 6. 모형 내보내기/불러오기 (JSON) ---
+# 생물은 이름으로 저장해 사람이 읽을 수 있고, 카탈로그 순서가 바뀌어도 안전합니다.
+
+def ecosystem_to_json(ecosystem_data, **extra):
+    """압축 형태의 모형을 이름 기반 JSON 문자열로 바꿉니다. extra는 학생 이름 등 부가 정보."""
+    nodes = ecosystem_data["nodes"].tolist()
+    pop = ecosystem_data["initial_population"]
+    data = {
+        **extra,
+        "name": ecosystem_data.get("name", ""),
+        "nodes": [SPECIES_NAMES[n] for n in nodes],
+        "edges": [[SPECIES_NAMES[a], SPECIES_NAMES[b]] for a, b in ecosystem_data["edges"].tolist()],
+        "initial_population": {SPECIES_NAMES[n]: int(pop[n]) for n in nodes},
+        "removal_factor": ecosystem_data.get("removal_factor", 0.4),
+    }
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def ecosystem_from_json(text):
+    """ecosystem_to_json()으로 내보낸 JSON을 압축 형태의 모형으로 읽습니다."""
+    return ecosystem_from_dict(json.loads(text))
+
+
+def ecosystem_from_dict(data):
+    """JSON에서 읽은 dict를 압축 형태의 모형으로 바꿉니다.
+
+    형식이 맞지 않거나 카탈로그에 없는 생물이 있으면 ValueError를 냅니다.
+    - nodes: 생물 이름 리스트
+    - edges: [먹이, 포식자] 두 개짜리 리스트의 리스트 (양 끝 생물은 nodes에 있어야 함)
+    중복된 생물과 관계는 처음 나온 것만 남깁니다. (예전 nx.DiGraph처럼)
+    - initial_population: 생물 이름 -> 0 이상 POP_DTYPE 범위의 정수 (생략하면 모두 INITIAL_POP)
+    """
+    if not isinstance(data, dict):
+        raise ValueError("모형 JSON은 객체({...})여야 합니다.")
+    nodes, edges = data.get("nodes"), data.get("edges")
+    if not isinstance(nodes, list) or not isinstance(edges, list):
+        raise ValueError("nodes와 edges는 리스트여야 합니다.")
+    unknown = [str(n) for n in nodes if n not in SPECIES_ID]
+    if unknown:
+        raise ValueError(f"알 수 없는 생물: {', '.join(unknown)}")
+    bad_edges = [e for e in edges if not isinstance(e, list) or len(e) != 2]
+    if bad_edges:
+        raise ValueError(f"관계는 [먹이, 포식자] 두 개짜리 리스트여야 합니다: {bad_edges[0]!r}")
+    nodes = list(dict.fromkeys(nodes))
+    outside = [e for e in edges if e[0] not in nodes or e[1] not in nodes]
+    if outside:
+        raise ValueError(f"nodes에 없는 생물이 들어간 관계: {outside[0]!r}")
+    edges = list(dict.fromkeys(map(tuple, edges)))
+
+    population = data.get("initial_population", {n: INITIAL_POP for n in nodes})
+    if not isinstance(population, dict):
+        raise ValueError("initial_population은 생물 이름 -> 개체수 객체여야 합니다.")
+    unknown = [str(n) for n in population if n not in SPECIES_ID]
+    if unknown:
+        raise ValueError(f"initial_population에 알 수 없는 생물: {', '.join(unknown)}")
+    limit = np.iinfo(POP_DTYPE).max
+    bad_counts = [n for n, c in population.items()
+                  if isinstance(c, bool) or not isinstance(c, int) or not 0 <= c <= limit]
+    if bad_counts:
+        raise ValueError(f"개체수는 0 이상 {limit:,} 이하의 정수여야 합니다: {', '.join(bad_counts)}")
+
+    return compact_ecosystem(
+        data.get("name", ""), nodes, edges, population, removal_factor=data.get("removal_factor", 0.4),
+    )
+
+
+# --- 7. 정규형과 내용 해시 (세션 사이 공유 캐시의 키) ---
+# 시뮬레이션 규칙이 바뀌면 ENGINE_VERSION을 올려 저장된 결과(utils.store)를 무효화합니다.
+ENGINE_VERSION = "1"
+
+# 같은 먹이그물을 다른 순서로 만들어도 같은 키가 나오도록 생물은 ID 순,
+# 간선은 (먹이, 포식자) 순으로 정렬한 정규형을 해시합니다. 이름은 키에 넣지 않습니다.
+
+def canonical_ecosystem(ecosystem_data):
+    """생물과 간선을 정렬한 정규형 모형. 이미 정렬돼 있으면 같은 배열을 그대로 씁니다."""
+    nodes, edges = ecosystem_data["nodes"], ecosystem_data["edges"]
+    return {
+        **ecosystem_data,
+        "nodes": np.sort(nodes),
+        "edges": edges[np.lexsort((edges[:, 1], edges[:, 0]))] if len(edges) else edges,
+    }
+
+
+def web_hash(nodes, edges):
+    """정규형 먹이그물 구조(생물, 간선)의 해시. 배치 좌표처럼 구조에만 달린 값의 키.
+
+    카탈로그 모형은 ID_DTYPE 바이트로 해시합니다. (기존 캐시 키 유지) ID가 그보다 큰
+    합성 먹이그물(utils.synthetic)은 잘리지 않도록 int32 바이트로 해시합니다.
+    """
+    dtype = ID_DTYPE if len(nodes) == 0 or int(np.max(nodes)) <= np.iinfo(ID_DTYPE).max else np.int32
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(nodes, dtype=dtype).tobytes())
+    digest.update(b"|")
+    digest.update(np.ascontiguousarray(edges, dtype=dtype).tobytes())
+    return digest.hexdigest()
+
+
+def ecosystem_hash(ecosystem_data):
+    """정규형 모형(구조 + 초기 개체수 + 제거 계수)의 해시."""
+    canonical = canonical_ecosystem(ecosystem_data)
+    digest = hashlib.sha1(web_hash(canonical["nodes"], canonical["edges"]).encode())
+    digest.update(np.ascontiguousarray(canonical["initial_population"], dtype=POP_DTYPE).tobytes())
+    digest.update(repr(float(canonical.get("removal_factor", 0.4))).encode())
+    return digest.hexdigest()
+
+
+def shock_key(change_target, change_type, change_value):
+    """충격 설정의 정규형. 제거(멸종)는 변화율과 관계없으므로 0으로 맞춥니다."""
+    if change_type == "제거 (멸종)":
+        change_value = 0
+    return int(change_target), change_type, int(change_value)
+
+
+# --- 8. 결과 표 (열 단위) ---
+# 페이지 2의 상세 분석은 생물마다 위젯을 만들지 않고 st.dataframe 표 하나로 보여 줍니다.
+# 표는 열 이름 -> 배열 dict라서 그대로 넘기거나, 같은 불리언 마스크로 행을 거를 수 있습니다.
+
+CHANGE_LABELS = np.array(["🔴 감소", "⚪ 그대로", "🟢 증가"], dtype=object)
+
+
+def population_change_table(nodes, initial_pop, new_pop):
+    """생물별 실험 전/후 개체수 표. 행 순서는 nodes 순서입니다."""
+    before = initial_pop[nodes].astype(np.int64)
+    after = new_pop[nodes].astype(np.int64)
+    change = after - before
+    rate = np.divide(change * 100.0, before, out=np.zeros(len(nodes)), where=before > 0)
+    return {
+        "생물": np.array([species_label(n) for n in nodes.tolist()], dtype=object),
+        "영양 단계": np.array(TL_ORDER, dtype=object)[SPECIES_TL[nodes]],
+        "실험 전": before,
+        "실험 후": after,
+        "변화": change,
+        "변화율(%)": rate.round(1),
+        "상태": CHANGE_LABELS[np.sign(change) + 1],
+    }
+
+
+def log_table(log, names=SPECIES_NAMES):
+    """시뮬레이션 로그 레코드 배열을 단계별 표로 만듭니다. (설명은 마크다운 강조 없이)"""
+    name_of = np.array((*names, ""), dtype=object)  # 상대가 없는 레코드(-1)는 빈 칸
+    return {
+        "단계": np.arange(1, len(log) + 1),
+        "충격 받은 생물": name_of[log["target"]],
+        "영향 받은 생물": name_of[log["other"]],
+        "설명": np.array([format_log_record(r, names).replace("**", "") for r in log], dtype=object),
+    }
+
+
+def filter_table(table, mask):
+    """표의 모든 열에 같은 행 마스크를 적용합니다."""
+    return {column: values[mask] for column, values in table.items()}
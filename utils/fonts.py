@@ -1,6 +1,42 @@
 import streamlit as st
 import os
 import base64
+from pathlib import Path
+
+from utils.plotting import FONT_PATH
+
+
+@st.cache_resource(show_spinner=False)
+def build_nanum_font_css(font_path=FONT_PATH):
+    """폰트 파일을 base64로 인코딩한 @font-face CSS를 만듭니다.
+
+    2MB 폰트를 매 실행마다 다시 인코딩하지 않도록 서버 프로세스 전체에서 캐시합니다.
+    """
+    # 폰트 파일을 base64로 인코딩
+    b64 = base64.b64encode(Path(font_path).read_bytes()).decode("utf-8")
+
+    # CSS 스타일 정의
+    return f"""
+    <style>
+    @font-face {{
+        font-family: 'NanumGothicLocal';
+        src: url('data:font/ttf;base64,{b64}') format('truetype');
+        font-weight: normal;
+        font-style: normal;
+        font-display: swap;
+    }}
+    
+    /* Streamlit의 모든 UI 요소에 폰트 적용 */
+    html, body, .stApp, [class*="css"] {{
+        font-family: 'NanumGothicLocal', 'NanumGothic', sans-serif !important;
+    }}
+    
+    /* 헤더, 마크다운 텍스트 등에도 명시적으로 적용 */
+    h1, h2, h3, h4, h5, h6, .stMarkdown {{
+        font-family: 'NanumGothicLocal', 'NanumGothic', sans-serif !important;
+    }}
+    </style>
+    """
 
 
 def inject_nanum_font():
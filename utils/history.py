@@ -0,0 +1,178 @@
+"""먹이그물 편집 기록 (버전 관리, 되돌리기/다시 하기).
+
+학생의 편집은 "생물 추가"와 "화살표 추가"뿐이라 모형은 항상 뒤에 덧붙기만 합니다.
+그래서 버전마다 모형을 복사하지 않고, 하나의 덧붙이기 전용 버퍼(branch)에 생물과
+간선을 쌓고 각 버전은 (생물 수, 간선 수) 접두사 길이만 기록합니다.
+
+- 어떤 버전의 모형이든 버퍼의 앞부분을 가리키는 numpy 뷰라서 복사 없이 꺼냅니다.
+  (버퍼가 커질 때 새 배열로 옮겨도 이미 꺼낸 뷰의 내용은 바뀌지 않습니다.)
+- 되돌리기/다시 하기는 현재 버전 번호만 바꾸므로 O(1)입니다.
+- 되돌린 상태에서 새로 편집하면(가지치기) 그 버전의 접두사만 새 버퍼로 복사하고,
+  원래 버퍼와 거기에 속한 버전은 그대로 남아 계속 꺼내 볼 수 있습니다.
+- 초기화도 하나의 버전(빈 모형)으로 기록되므로 되돌릴 수 있습니다.
+
+버전 목록은 구조화된 배열(VERSION_DTYPE)이라 버전 수백 개도 수 KB입니다.
+Streamlit을 import하지 않습니다.
+"""
+import sys
+
+import numpy as np
+
+from utils.ecosystem import ID_DTYPE, INITIAL_POP, SPECIES_NAMES, empty_population, species_label
+
+# 버전 레코드: 어느 버퍼의 접두사인지, 부모 버전, 어떤 편집으로 만들어졌는지
+VERSION_DTYPE = np.dtype([
+    ("branch", np.int16), ("n_nodes", np.int16), ("n_edges", np.int32),
+    ("parent", np.int32), ("op", np.uint8), ("a", np.int8), ("b", np.int8),
+])
+
+OP_START, OP_ADD_SPECIES, OP_ADD_EDGE, OP_RESET = range(4)
+
+
+class _Branch:
+    """덧붙이기 전용 생물/간선 버퍼. 용량이 차면 두 배로 늘립니다."""
+
+    def __init__(self, nodes=None, edges=None):
+        nodes = np.empty(0, dtype=ID_DTYPE) if nodes is None else nodes
+        edges = np.empty((0, 2), dtype=ID_DTYPE) if edges is None else edges
+        self.n_nodes, self.n_edges = len(nodes), len(edges)
+        self.nodes = np.empty(max(16, 2 * self.n_nodes), dtype=ID_DTYPE)
+        self.edges = np.empty((max(32, 2 * self.n_edges), 2), dtype=ID_DTYPE)
+        self.nodes[:self.n_nodes] = nodes
+        self.edges[:self.n_edges] = edges
+
+    def append_node(self, sid):
+        if self.n_nodes == len(self.nodes):
+            self.nodes = np.concatenate([self.nodes, np.empty_like(self.nodes)])
+        self.nodes[self.n_nodes] = sid
+        self.n_nodes += 1
+
+    def append_edge(self, prey, predator):
+        if self.n_edges == len(self.edges):
+            self.edges = np.concatenate([self.edges, np.empty_like(self.edges)])
+        self.edges[self.n_edges] = (prey, predator)
+        self.n_edges += 1
+
+    @property
+    def nbytes(self):
+        return self.nodes.nbytes + self.edges.nbytes
+
+
+class WebHistory:
+    """먹이그물 편집 기록. 버전 0은 빈 모형입니다."""
+
+    def __init__(self):
+        self._branches = [_Branch()]
+        self._versions = np.zeros(16, dtype=VERSION_DTYPE)
+        self._versions[0] = (0, 0, 0, -1, OP_START, -1, -1)
+        self._count = 1
+        self.current = 0
+        self._redo = []
+
+    def __len__(self):
+        return self._count
+
+    def __sizeof__(self):
+        return (object.__sizeof__(self) + self._versions.nbytes
+                + sum(branch.nbytes for branch in self._branches) + sys.getsizeof(self._redo))
+
+    @property
+    def versions(self):
+        """지금까지의 모든 버전 레코드 (읽기 전용 뷰)."""
+        view = self._versions[:self._count]
+        view.flags.writeable = False
+        return view
+
+    # --- 버전 내용 꺼내기 (복사 없음) ---
+    def nodes(self, version=None):
+        v = self._versions[self.current if version is None else version]
+        view = self._branches[v["branch"]].nodes[:v["n_nodes"]]
+        view.flags.writeable = False
+        return view
+
+    def edges(self, version=None):
+        v = self._versions[self.current if version is None else version]
+        view = self._branches[v["branch"]].edges[:v["n_edges"]]
+        view.flags.writeable = False
+        return view
+
+    def population(self, version=None):
+        """버전의 초기 개체수 벡터. (추가한 생물은 모두 INITIAL_POP)"""
+        pop = empty_population()
+        pop[self.nodes(version)] = INITIAL_POP
+        return pop
+
+    def describe(self, version):
+        """버전을 한 줄로 설명합니다. 예: 'v3 · ➕ 🐍 뱀'"""
+        v = self._versions[version]
+        if v["op"] == OP_ADD_SPECIES:
+            what = f"➕ {species_label(v['a'])}"
+        elif v["op"] == OP_ADD_EDGE:
+            what = f"🔗 {SPECIES_NAMES[v['a']]} → {SPECIES_NAMES[v['b']]}"
+        elif v["op"] == OP_RESET:
+            what = "🔄 초기화"
+        else:
+            what = "처음 (빈 모형)"
+        return f"v{version} · {what} ({v['n_nodes']}종, {v['n_edges']}관계)"
+
+    # --- 편집 (새 버전 기록) ---
+    def _tip_branch(self):
+        """현재 버전 뒤에 덧붙일 수 있는 버퍼. 현재 버전이 버퍼의 끝이 아니면 접두사를 복사해 새로 만듭니다."""
+        v = self._versions[self.current]
+        branch = self._branches[v["branch"]]
+        if branch.n_nodes == v["n_nodes"] and branch.n_edges == v["n_edges"]:
+            return v["branch"]
+        self._branches.append(_Branch(self.nodes(), self.edges()))
+        return len(self._branches) - 1
+
+    def _record(self, branch_id, op, a=-1, b=-1):
+        if self._count == len(self._versions):
+            self._versions = np.concatenate([self._versions, np.zeros_like(self._versions)])
+        branch = self._branches[branch_id]
+        self._versions[self._count] = (branch_id, branch.n_nodes, branch.n_edges, self.current, op, a, b)
+        self.current = self._count
+        self._count += 1
+        self._redo.clear()
+        return self.current
+
+    def add_species(self, sid):
+        branch_id = self._tip_branch()
+        self._branches[branch_id].append_node(sid)
+        return self._record(branch_id, OP_ADD_SPECIES, sid)
+
+    def add_edge(self, prey, predator):
+        branch_id = self._tip_branch()
+        self._branches[branch_id].append_edge(prey, predator)
+        return self._record(branch_id, OP_ADD_EDGE, prey, predator)
+
+    def reset(self):
+        self._branches.append(_Branch())
+        return self._record(len(self._branches) - 1, OP_RESET)
+
+    # --- 되돌리기 / 다시 하기 / 버전 이동 (O(1)) ---
+    @property
+    def can_undo(self):
+        return self._versions[self.current]["parent"] >= 0
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo(self):
+        if self.can_undo:
+            self._redo.append(self.current)
+            self.current = int(self._versions[self.current]["parent"])
+        return self.current
+
+    def redo(self):
+        if self._redo:
+            self.current = self._redo.pop()
+        return self.current
+
+    def checkout(self, version):
+        """임의의 버전으로 이동합니다. (다시 하기 기록은 비웁니다)"""
+        if not 0 <= version < self._count:
+            raise IndexError(f"없는 버전: {version}")
+        self.current = version
+        self._redo.clear()
+        return self.current
@@ -0,0 +1,198 @@
+"""공간(격자) 생태계 시뮬레이션 (Streamlit 없이 import 가능한 엔진).
+
+run_simulation_step_by_step()은 생태계 전체를 개체수 하나로 다루지만, 이 모드에서는
+먹이그물의 각 생물이 H×W 격자(기본 256×256)의 칸마다 밀도(0~1)를 가집니다.
+한 단계(step)마다 모든 칸을 numpy 배열 연산으로 한꺼번에 갱신합니다. (칸 단위 파이썬 반복 없음)
+
+- 생산자: 칸마다 로지스틱 성장 r·N·(1 - N)
+- 먹고 먹힘: 간선 [먹이, 포식자]로 만든 행렬 A로 모든 칸의 포식 압력을 한 번에 계산
+  (포식자의 사냥 노력은 먹이 종 수로 나눠, 먹이가 많은 포식자도 한 먹이를 몰살하지 않음)
+    먹이 손실   a·N_먹이·(A @ N)
+    포식자 이득 e·a·N_포식자·(Aᵀ @ N)
+- 소비자 사망: m·N
+- 퍼짐(이동): 5점 라플라시안 합성곱 D·∇²N (격자 가장자리는 닫혀 있음)
+- 국지적 멸종: 밀도가 EXTINCT 아래로 떨어진 칸은 0으로 (마스크 갱신)
+
+shock_local_extinction()으로 한 생물을 원 모양 구역에서 없애면, 그 빈자리가
+먹이그물을 따라 주변 칸과 다른 생물로 번져 나가는 모습을 볼 수 있습니다.
+
+tiles > 1이면 격자를 가로 띠로 나눠 스레드 풀에서 동시에 계산합니다. 큰 배열 연산은
+GIL을 놓으므로 여러 코어를 씁니다. 띠마다 이전 상태에서 위아래 한 줄(halo)을 더 읽고
+새 상태 배열의 자기 띠에만 쓰므로(이중 버퍼), 결과는 tiles=1과 같습니다.
+"""
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from utils.ecosystem import SPECIES_TL, TL_COLORS
+
+GRID_SIZE = 256
+EXTINCT = 1e-3  # 이보다 낮은 밀도는 그 칸에서 멸종
+
+# 기본 매개변수 (dt·D·4 < 1 이어야 퍼짐 계산이 안정적)
+DEFAULT_PARAMS = {
+    "dt": 0.2,       # 한 단계의 시간 간격
+    "growth": 1.0,   # 생산자 성장률 r
+    "attack": 1.5,   # 포식률 a
+    "efficiency": 0.6,  # 먹은 양이 포식자로 바뀌는 비율 e
+    "mortality": 0.1,   # 소비자 사망률 m
+    "diffusion": 0.2,   # 퍼짐 계수 D
+}
+
+
+class Lattice:
+    """먹이그물 하나의 격자 상태. density[k]는 nodes[k] 생물의 밀도 지도입니다."""
+
+    def __init__(self, nodes, edges, size=GRID_SIZE, seed=0, params=None, tiles=1):
+        self.nodes = np.asarray(nodes).copy()
+        self.params = {**DEFAULT_PARAMS, **(params or {})}
+        self.tiles = max(1, int(tiles))
+        self.steps = 0
+        self.blocked = {}  # 생물 위치 -> 그 생물이 살 수 없는 칸 마스크 (서식지 파괴)
+
+        k = len(self.nodes)
+        index = {int(sid): i for i, sid in enumerate(self.nodes.tolist())}
+        # A[i, j] > 0 이면 j가 i를 먹음 (j의 먹이 종 수로 나눈 비율)
+        self.A = np.zeros((k, k), dtype=np.float32)
+        for prey, predator in np.asarray(edges).tolist():
+            self.A[index[prey], index[predator]] = 1.0
+        self.A /= np.maximum(self.A.sum(axis=0), 1.0)
+        self.AT = np.ascontiguousarray(self.A.T)
+        self.is_producer = (SPECIES_TL[self.nodes] == 0)[:, None, None]
+
+        # 처음에는 모든 칸에 고르게 (약간의 무작위 얼룩)
+        rng = np.random.default_rng(seed)
+        self.density = (0.5 + 0.1 * rng.standard_normal((k, size, size))).clip(0, 1).astype(np.float32)
+        self._next = np.empty_like(self.density)
+        self._pool = ThreadPoolExecutor(self.tiles, thread_name_prefix="eco-lattice") if self.tiles > 1 else None
+
+    # --- 1. 충격 (마스크 갱신) ---
+    def shock_local_extinction(self, species_id, center=None, radius=None, persistent=False):
+        """species_id 생물을 center 주변 원 안의 모든 칸에서 없앱니다.
+
+        persistent=True이면 서식지가 사라진 것처럼 매 단계 그 구역을 계속 비워 둡니다.
+        """
+        _, h, w = self.density.shape
+        cy, cx = center if center is not None else (h // 2, w // 2)
+        radius = radius if radius is not None else h // 8
+        yy, xx = np.ogrid[:h, :w]
+        mask = (yy - cy) ** 2 + (xx - cx) ** 2 <= radius ** 2
+        k = int(np.flatnonzero(self.nodes == species_id)[0])
+        self.density[k][mask] = 0.0
+        if persistent:
+            self.blocked[k] = mask | self.blocked.get(k, False)
+        return mask
+
+    # --- 2. 한 단계 갱신 ---
+    def _update_rows(self, r0, r1):
+        """이전 상태(self.density)의 [r0, r1) 행을 계산해 self._next에 씁니다."""
+        p = self.params
+        N = self.density
+        _, h, _ = N.shape
+        # 위아래 한 줄(halo)을 포함해 읽기. 가장자리는 자기 자신을 복제(닫힌 경계)
+        lo, hi = max(r0 - 1, 0), min(r1 + 1, h)
+        padded = np.pad(N[:, lo:hi], ((0, 0), (int(lo == r0), int(hi == r1)), (1, 1)), mode="edge")
+        center = N[:, r0:r1]
+        lap = (padded[:, :-2, 1:-1] + padded[:, 2:, 1:-1]
+               + padded[:, 1:-1, :-2] + padded[:, 1:-1, 2:] - 4 * center)
+
+        k = N.shape[0]
+        flat = center.reshape(k, -1)
+        pressure = (self.A @ flat).reshape(center.shape)  # 나를 먹는 포식자 밀도 합
+        food = (self.AT @ flat).reshape(center.shape)     # 내가 먹는 먹이 밀도 합
+
+        growth = np.where(
+            self.is_producer,
+            p["growth"] * center * (1 - center),
+            p["efficiency"] * p["attack"] * center * food - p["mortality"] * center,
+        )
+        delta = growth - p["attack"] * center * pressure + p["diffusion"] * lap
+
+        out = self._next[:, r0:r1]
+        np.multiply(delta, p["dt"], out=out)
+        out += center
+        np.clip(out, 0.0, 1.0, out=out)
+        out[out < EXTINCT] = 0.0
+        for k, mask in self.blocked.items():
+            out[k][mask[r0:r1]] = 0.0
+
+    def step(self, n=1):
+        """n단계 진행합니다."""
+        h = self.density.shape[1]
+        for _ in range(n):
+            if self._pool is None:
+                self._update_rows(0, h)
+            else:
+                bounds = np.linspace(0, h, self.tiles + 1).astype(int)
+                list(self._pool.map(self._update_rows, bounds[:-1], bounds[1:]))
+            self.density, self._next = self._next, self.density
+            self.steps += 1
+        return self
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+
+    # --- 3. 관찰 ---
+    def occupied(self):
+        """생물별로 살아 있는 칸의 비율."""
+        return (self.density > 0).mean(axis=(1, 2))
+
+    def richness(self):
+        """칸마다 살아 있는 생물 종 수 (uint8 지도)."""
+        return (self.density > 0).sum(axis=0, dtype=np.uint8)
+
+
+# --- 4. 프레임 이미지 (팔레트 PNG) ---
+# matplotlib 없이 밀도를 팔레트 색 번호로 바꿔 작은 PNG로 저장합니다.
+
+PALETTE_LEVELS = 32
+
+
+def _hex_to_rgb(color):
+    from PIL import ImageColor
+    return np.array(ImageColor.getrgb(color), dtype=np.float32)
+
+
+def _palette(color, levels=PALETTE_LEVELS):
+    """흰색 -> color로 가는 levels단계 팔레트 (PIL 형식의 평평한 리스트)."""
+    t = np.linspace(0, 1, levels, dtype=np.float32)[:, None]
+    rgb = (1 - t) * 255 + t * _hex_to_rgb(color)
+    return rgb.astype(np.uint8).ravel().tolist()
+
+
+def _to_png(indices, palette, scale=1):
+    from PIL import Image
+
+    image = Image.fromarray(indices, mode="P")
+    image.putpalette(palette)
+    if scale != 1:
+        image = image.resize((image.width * scale, image.height * scale), Image.NEAREST)
+    buf = io.BytesIO()
+    image.save(buf, format="png", optimize=False, compress_level=6)
+    return buf.getvalue()
+
+
+def density_png(lattice, species_id, scale=1):
+    """한 생물의 밀도 지도를 그 생물의 영양 단계 색으로 그린 PNG 바이트."""
+    k = int(np.flatnonzero(lattice.nodes == species_id)[0])
+    indices = np.rint(lattice.density[k] * (PALETTE_LEVELS - 1)).astype(np.uint8)
+    return _to_png(indices, _palette(TL_COLORS[SPECIES_TL[species_id]]), scale)
+
+
+def richness_png(lattice, scale=1):
+    """칸마다 살아 있는 종 수를 그린 PNG 바이트. (흰색 = 모두 멸종, 진한 초록 = 모든 종 생존)"""
+    k = len(lattice.nodes)
+    levels = k + 1
+    indices = lattice.richness()
+    return _to_png(indices, _palette("darkgreen", levels), scale)
+
+
+def steps_per_second(lattice, steps=50):
+    """현재 설정으로 초당 몇 단계를 계산하는지 잽니다."""
+    import time
+
+    t0 = time.perf_counter()
+    lattice.step(steps)
+    return steps / max(time.perf_counter() - t0, 1e-9)
@@ -0,0 +1,60 @@
+"""matplotlib / 폰트 지연 로딩 도우미.
+
+matplotlib.pyplot(~0.5초)과 networkx(~0.2초)는 import 비용이 커서
+페이지 모듈 최상단에서 불러오지 않습니다. 그래프를 실제로 그리는 함수 안에서
+get_pyplot() / get_font_properties()를 호출해 처음 필요할 때 한 번만 불러옵니다.
+"""
+import os
+
+FONT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "fonts", "NanumGothic.ttf"))
+
+_pyplot = None
+_font_properties = None
+
+
+def get_pyplot():
+    """matplotlib.pyplot을 불러오고 한글 폰트 설정을 한 번만 적용합니다."""
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib.pyplot as plt
+
+        # --- matplotlib 한글 폰트 설정 ---
+        # 로컬 나눔고딕을 등록해 맨 앞에 두면 fontproperties를 주지 않은 글자도 한글로 그려집니다.
+        # (서버에 없는 폰트 이름을 앞에 두면 그림마다 findfont 경고가 납니다)
+        register_fonts()
+        plt.rcParams['font.family'] = ['NanumGothic', 'sans-serif'] if os.path.exists(FONT_PATH) else 'sans-serif'
+
+        plt.rcParams['axes.unicode_minus'] = False # 마이너스 폰트 깨짐 방지
+        _pyplot = plt
+    return _pyplot
+
+
+def new_figure(figsize):
+    """pyplot 전역 상태를 거치지 않는 Figure와 Axes를 만듭니다.
+
+    여러 세션(스레드)이 동시에 그려도 서로의 그림에 간섭하지 않고,
+    plt.close() 없이도 Figure가 메모리에서 정리됩니다.
+    """
+    get_pyplot()  # 한글 폰트 rcParams 설정 보장
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    return fig, fig.subplots()
+
+
+def register_fonts():
+    """로컬 폰트 파일을 matplotlib 폰트 목록에 등록합니다. (처음 호출 시 폰트 캐시도 만들어짐)"""
+    from matplotlib import font_manager
+
+    if os.path.exists(FONT_PATH):
+        font_manager.fontManager.addfont(FONT_PATH)
+    return font_manager.fontManager
+
+
+def get_font_properties():
+    """로컬 NanumGothic.ttf의 FontProperties를 돌려줍니다. 파일이 없으면 None."""
+    global _font_properties
+    if _font_properties is None and os.path.exists(FONT_PATH):
+        from matplotlib import font_manager
+        _font_properties = font_manager.FontProperties(fname=FONT_PATH)
+    return _font_properties
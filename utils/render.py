@@ -0,0 +1,117 @@
+"""그림 명세(spec)를 이미지 바이트로 렌더링합니다.
+
+명세는 좌표, 색, 라벨, 막대 값처럼 그리기에 필요한 값만 담은 dict라서
+pickle로 워커 프로세스에 보낼 수 있습니다. 이 모듈은 Streamlit을 import하지
+않으므로 렌더링 워커(utils.render_pool)가 가볍게 불러 쓸 수 있습니다.
+
+- network: 먹이그물 (nodes, edges, pos, colors, labels, title ...)
+- pyramid: 생태 피라미드 가로 막대 (labels, values, colors, title ...)
+
+출력 형식은 명세의 format / dpi / palette 값으로 정합니다. (utils.charts.CHART_OUTPUT)
+- png: palette가 있으면 색 수를 줄인 팔레트 PNG로 저장합니다. 면 색이 몇 개뿐인
+  도표라서 화질 차이는 거의 없고 크기는 1/4~1/5로 줄어듭니다.
+- svg: 글자를 경로(path)로 넣어 학생 PC에 한글 폰트가 없어도 보이게 합니다.
+  쓰인 글자만 한 번씩 들어가지만, 한글 글자 모양이 복잡해 팔레트 PNG보다 큽니다.
+"""
+import io
+
+from utils.plotting import get_font_properties, new_figure
+
+# 그리는 방식이 바뀌면 올려서 저장된 이미지(utils.store)를 무효화합니다.
+RENDER_VERSION = "1"
+
+# st.pyplot()의 기본 저장 옵션과 같게 맞춥니다.
+SAVEFIG_OPTIONS = {"format": "png", "bbox_inches": "tight", "dpi": 200}
+
+
+def figure_to_png(fig, dpi=SAVEFIG_OPTIONS["dpi"], palette=None):
+    """Figure를 PNG 바이트로 저장합니다. palette(색 수)를 주면 팔레트 PNG로 줄입니다."""
+    buf = io.BytesIO()
+    fig.savefig(buf, **{**SAVEFIG_OPTIONS, "dpi": dpi})
+    if not palette:
+        return buf.getvalue()
+
+    from PIL import Image
+
+    image = Image.open(buf).convert("RGB").quantize(palette, dither=Image.Dither.NONE)
+    out = io.BytesIO()
+    image.save(out, format="png", optimize=True)
+    return out.getvalue()
+
+
+def figure_to_svg(fig):
+    """Figure를 SVG 문자열로 저장합니다. (st.image()에 그대로 넘길 수 있음)"""
+    import matplotlib
+
+    buf = io.StringIO()
+    with matplotlib.rc_context({"svg.fonttype": "path"}):
+        fig.savefig(buf, format="svg", bbox_inches="tight")
+    return buf.getvalue()
+
+
+def render_network(spec):
+    """먹이그물 명세를 그립니다."""
+    import networkx as nx
+    fp = get_font_properties()
+
+    fig, ax = new_figure(figsize=spec["figsize"])
+    G = nx.DiGraph()
+    G.add_nodes_from(spec["nodes"])
+    G.add_edges_from(spec["edges"])
+    pos = spec["pos"]
+
+    nx.draw_networkx_nodes(G, pos, ax=ax, node_color=spec["colors"], node_size=spec["node_size"], alpha=0.9)
+    nx.draw_networkx_edges(G, pos, ax=ax, edge_color="gray", arrowsize=spec["arrowsize"], width=spec["width"])
+
+    labels = spec["labels"]
+    if fp:
+        for n, label in labels.items():
+            x, y = pos[n]
+            ax.text(x, y, label, fontproperties=fp, fontsize=spec["fontsize"], ha='center', va='center')
+    else:
+        nx.draw_networkx_labels(G, pos, labels, ax=ax, font_size=spec["fontsize"])
+
+    ax.set_title(spec["title"], fontsize=spec.get("title_size", 12), fontproperties=fp)
+    ax.axis('off')
+    return fig
+
+
+def render_pyramid(spec):
+    """생태 피라미드(가로 막대) 명세를 그립니다."""
+    fp = get_font_properties()
+
+    labels, values = spec["labels"], spec["values"]
+    y_pos = range(len(labels))
+
+    fig, ax = new_figure(figsize=spec["figsize"])
+
+    bars = ax.barh(y_pos, values, color=spec["colors"], edgecolor='black', align='center', height=0.7)
+
+    ax.set_yticks(y_pos, labels=labels, fontproperties=fp, fontsize=9)
+    ax.set_xlabel(spec["xlabel"], fontproperties=fp, fontsize=9)
+    ax.set_title(spec["title"], fontsize=12, fontproperties=fp)
+
+    for i, (bar, value) in enumerate(zip(bars, values)):
+        ax.text(bar.get_width() + 3, i, f"{value}", va='center', ha='left', fontproperties=fp, fontsize=8)
+
+    ax.invert_yaxis()
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    return fig
+
+
+RENDERERS = {
+    "network": render_network,
+    "pyramid": render_pyramid,
+}
+
+
+def render_spec(spec):
+    """명세 하나를 이미지로 렌더링합니다. (워커 프로세스의 진입점)
+
+    png는 bytes, svg는 str을 돌려줍니다. 둘 다 st.image()로 표시할 수 있습니다.
+    """
+    fig = RENDERERS[spec["kind"]](spec)
+    if spec.get("format") == "svg":
+        return figure_to_svg(fig)
+    return figure_to_png(fig, dpi=spec.get("dpi", SAVEFIG_OPTIONS["dpi"]), palette=spec.get("palette"))
@@ -0,0 +1,128 @@
+"""그래프 렌더링 워커 풀.
+
+모든 세션이 한 파이썬 프로세스를 공유하므로, matplotlib 래스터화가 GIL을 잡고 있는
+동안에는 다른 학생의 화면 갱신이 멈춥니다. 이 모듈은 그림 명세(utils.render)를
+워커 프로세스로 보내 이미지(PNG 바이트 또는 SVG 문자열)로 받아 옵니다.
+
+- 한 페이지의 그림 여러 개(페이지 2는 4개)를 동시에 제출해 병렬로 렌더링합니다.
+- 애니메이션은 프레임을 몇 장 앞서 제출해, 화면에 한 장을 보여 주는 동안 다음 장을 그립니다.
+- 처리 중인 작업 수는 max_pending으로 제한됩니다. 자리가 없으면 제출하는 쪽이
+  queue_timeout초까지 기다리고(backpressure), 그래도 막혀 있으면 그 자리에서 직접 그립니다.
+- 워커가 죽으면 풀을 새로 만들고 해당 그림은 직접 그립니다.
+
+환경 변수 ECO_RENDER_WORKERS로 워커 수를 정합니다. 기본값 "auto"는 코어 수에 맞춰
+(AUTO_WORKERS) 워커를 띄우고, 1코어 서버에서는 0(풀 없이 직접 그림)이 됩니다.
+1코어 환경에서 잰 scripts/bench_render.py 결과는 풀이 직접 렌더링보다 느렸습니다.
+(p99 32.7초 vs 26.9초) 여러 코어 서버에서 p99가 줄어드는지는 아직 재지 않았습니다.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from utils.render import render_spec
+
+logger = logging.getLogger(__name__)
+
+# ECO_RENDER_WORKERS=auto 일 때의 워커 수. 코어 하나는 Streamlit 서버 몫으로 남겨 둡니다.
+# (1코어 서버에서는 0 = 직접 렌더링)
+AUTO_WORKERS = max(0, min(4, (os.cpu_count() or 1) - 1))
+DEFAULT_WORKERS = "auto"
+
+
+def configured_workers():
+    """ECO_RENDER_WORKERS 값(정수 또는 "auto")으로 정한 워커 수."""
+    value = os.environ.get("ECO_RENDER_WORKERS", DEFAULT_WORKERS).strip().lower()
+    return AUTO_WORKERS if value == "auto" else int(value)
+
+
+class RenderPool:
+    """그림 명세를 워커 프로세스에서 렌더링하는 제한된 작업 큐."""
+
+    def __init__(self, workers=AUTO_WORKERS, max_pending=None, queue_timeout=2.0):
+        self.workers = workers
+        self.max_pending = max_pending or max(1, workers) * 4
+        self.queue_timeout = queue_timeout
+        self.stats = {"submitted": 0, "inline": 0, "queue_full": 0, "broken": 0}
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # Streamlit 서버는 스레드가 많으므로 fork 대신 spawn으로 깨끗한 워커를 띄웁니다.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _render_inline(self, spec, reason):
+        self.stats[reason] += 1
+        future = Future()
+        future.set_result(render_spec(spec))
+        return future
+
+    def submit(self, spec):
+        """명세 하나를 제출하고 이미지를 담을 Future를 돌려줍니다."""
+        if self.workers <= 0:
+            return self._render_inline(spec, "inline")
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            return self._render_inline(spec, "queue_full")
+        try:
+            future = self._get_executor().submit(render_spec, spec)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._reset()
+            return self._render_inline(spec, "broken")
+        self.stats["submitted"] += 1
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def result(self, spec, future):
+        """submit()으로 받은 Future의 이미지를 꺼냅니다. 워커가 죽었으면 직접 그립니다."""
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            self._reset()
+            return self._render_inline(spec, "broken").result()
+
+    def render_many(self, specs):
+        """명세 여러 개를 한꺼번에 제출해 동시에 렌더링하고, 같은 순서로 이미지를 돌려줍니다."""
+        futures = [self.submit(spec) for spec in specs]
+        return [self.result(spec, future) for spec, future in zip(specs, futures)]
+
+    def _reset(self):
+        logger.warning("렌더링 워커 풀이 중단되어 다시 만듭니다.")
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def warm(self):
+        """워커 프로세스를 모두 띄우고 각각 matplotlib/폰트를 불러 두게 합니다."""
+        if self.workers > 0:
+            spec = {"kind": "pyramid", "figsize": (1, 1), "labels": ["한글"], "values": [1],
+                    "colors": ["white"], "xlabel": "", "title": ""}
+            self.render_many([spec] * self.workers)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_render_pool():
+    """프로세스 전체에서 공유하는 렌더링 풀을 돌려줍니다."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = RenderPool(workers=configured_workers())
+        return _pool
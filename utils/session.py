@@ -0,0 +1,277 @@
+"""학생별 세션 상태를 압축된 형태로 관리합니다.
+
+세션에는 다음 값만 저장합니다.
+- user_nodes: 추가한 생물 ID 배열 (int8, 추가한 순서)
+- user_edges: [먹이 ID, 포식자 ID] 간선 배열 (int8, shape=(E, 2))
+- user_pop: 카탈로그 크기의 개체수 벡터 (int32)
+- simulated_pop / initial_pop_at_sim: 실험 결과 개체수 벡터 (int32)
+- simulation_log: 구조화된 로그 레코드 배열 (LOG_DTYPE)
+
+추가 가능한 생물 목록은 저장하지 않고 user_nodes에서 그때그때 계산합니다.
+
+모형 편집은 web_history(utils.history.WebHistory)에 버전으로 기록됩니다.
+user_nodes / user_edges는 현재 버전을 가리키는 읽기 전용 뷰이고, 편집할 때는
+add_species / add_edge / undo_edit / redo_edit / checkout_version을 거칩니다.
+"""
+import os
+import sys
+
+import numpy as np
+import streamlit as st
+
+from utils.cache import cache_stats
+from utils.store import get_result_store
+from utils.ecosystem import (
+    INITIAL_POP, LOG_DTYPE, NUM_SPECIES, SPECIES_NAMES, check_for_full_chain, ecosystem_to_json,
+    format_log_record,
+)
+from utils.history import WebHistory
+
+# 메모리 보고서에서 세는 세션 키
+SESSION_KEYS = (
+    "web_history", "user_nodes", "user_edges", "user_pop", "is_chain_completed",
+    "simulated_pop", "initial_pop_at_sim", "is_simulated", "simulation_log",
+)
+
+
+# --- 1. 초기화 ---
+
+def _sync_web():
+    """현재 버전의 모형을 user_nodes / user_edges / user_pop에 반영합니다. (뷰라서 복사 없음)"""
+    history = st.session_state.web_history
+    st.session_state.user_nodes = history.nodes()
+    st.session_state.user_edges = history.edges()
+    st.session_state.user_pop = history.population()
+
+
+def reset_model():
+    """모형 구성을 초기화합니다. 초기화도 하나의 버전으로 기록되어 되돌릴 수 있습니다."""
+    if 'web_history' in st.session_state:
+        st.session_state.web_history.reset()
+    else:
+        st.session_state.web_history = WebHistory()
+    _sync_web()
+    st.session_state.is_chain_completed = False  # 풍선 플래그 리셋
+
+
+def init_session_web():
+    """세션에 모형이 없으면 빈 모형으로 초기화합니다."""
+    if 'web_history' not in st.session_state:
+        st.session_state.web_history = WebHistory()
+        _sync_web()
+        st.session_state.is_chain_completed = False
+
+
+def clear_simulation(initial_pop):
+    """실험 결과를 초기 상태로 되돌립니다."""
+    st.session_state.simulated_pop = initial_pop.copy()
+    st.session_state.initial_pop_at_sim = initial_pop.copy()
+    st.session_state.is_simulated = False
+    st.session_state.simulation_log = np.empty(0, dtype=LOG_DTYPE)
+
+
+# --- 2. 모형 편집 ---
+
+def available_species():
+    """아직 추가하지 않은 생물 ID 목록을 카탈로그 순서대로 돌려줍니다."""
+    added = np.zeros(NUM_SPECIES, dtype=bool)
+    added[st.session_state.user_nodes] = True
+    return np.flatnonzero(~added).tolist()
+
+
+def add_species(sid):
+    """생물을 모형에 추가합니다. 이미 있으면 False를 돌려줍니다."""
+    if sid in st.session_state.user_nodes:
+        return False
+    st.session_state.web_history.add_species(sid)
+    _sync_web()
+    return True
+
+
+def _sync_chain():
+    """버전을 옮긴 뒤 완성 플래그를 그 버전의 모형에 맞춥니다. (체인이 끊긴 버전이면 다시 축하할 수 있음)"""
+    st.session_state.is_chain_completed = check_for_full_chain(st.session_state.user_edges)
+
+
+def has_edge(prey, predator):
+    edges = st.session_state.user_edges
+    return bool(np.any((edges[:, 0] == prey) & (edges[:, 1] == predator)))
+
+
+def add_edge(prey, predator):
+    """[먹이 → 포식자] 관계를 추가합니다."""
+    st.session_state.web_history.add_edge(prey, predator)
+    _sync_web()
+
+
+def undo_edit():
+    """마지막 편집을 되돌립니다."""
+    st.session_state.web_history.undo()
+    _sync_web()
+    _sync_chain()
+
+
+def redo_edit():
+    """되돌린 편집을 다시 적용합니다."""
+    st.session_state.web_history.redo()
+    _sync_web()
+    _sync_chain()
+
+
+def checkout_version(version):
+    """예전 버전으로 돌아갑니다. 이후 편집은 그 버전에서 새로 갈라집니다."""
+    st.session_state.web_history.checkout(version)
+    _sync_web()
+    _sync_chain()
+
+
+def user_ecosystem(version=None):
+    """세션의 모형(기본: 현재 버전)을 시뮬레이션 입력 형태로 돌려줍니다. 배열은 기록을 가리키는 뷰입니다."""
+    if version is None:
+        nodes, edges, pop = st.session_state.user_nodes, st.session_state.user_edges, st.session_state.user_pop
+        name = "내가 만든 모형"
+    else:
+        history = st.session_state.web_history
+        nodes, edges, pop = history.nodes(version), history.edges(version), history.population(version)
+        name = f"내가 만든 모형 (v{version})"
+    return {
+        "name": name,
+        "nodes": nodes,
+        "edges": edges,
+        "initial_population": pop,
+        "removal_factor": 0.4
+    }
+
+
+def render_export_button():
+    """현재 모형을 JSON 파일로 내려받는 버튼을 표시합니다. (선생님 일괄 평가용)"""
+    student = st.text_input("내 이름 (선생님께 제출할 때 적어 주세요)", key="export_student")
+    st.download_button(
+        "💾 내 모형 내려받기 (JSON)",
+        data=ecosystem_to_json(user_ecosystem(), student=student),
+        file_name=f"food_web_{student or 'student'}.json",
+        mime="application/json",
+    )
+
+
+# --- 3. 세션 메모리 보고서 ---
+
+def deep_sizeof(obj, _seen=None):
+    """객체가 실제로 차지하는 바이트 수를 (참조하는 내용까지) 재귀적으로 셉니다."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        # 뷰가 아닌 배열은 sys.getsizeof에 데이터 버퍼가 포함됩니다.
+        size = sys.getsizeof(obj)
+        return size if obj.base is None else size + obj.nbytes
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, _seen) + deep_sizeof(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, _seen) for item in obj)
+    return size
+
+
+# 예전 코드(정수 ID로 바꾸기 전)가 세션에 저장하던 키. web_history는 새로 생긴 키라 비교 대상이 없습니다.
+LEGACY_KEYS = (
+    "user_nodes", "user_edges", "user_pop", "available_species", "is_chain_completed",
+    "simulated_pop", "initial_pop_at_sim", "is_simulated", "simulation_log",
+)
+
+
+def _legacy_session_values():
+    """같은 상태를 예전 방식(이름 리스트, 튜플 리스트, dict, 문자열 로그)으로 표현한 값. (LEGACY_KEYS만)"""
+    state = st.session_state
+    legacy = {}
+    if 'user_nodes' in state:
+        names = [SPECIES_NAMES[i] for i in state.user_nodes]
+        legacy["user_nodes"] = names
+        legacy["user_edges"] = [(SPECIES_NAMES[a], SPECIES_NAMES[b]) for a, b in state.user_edges]
+        legacy["user_pop"] = {n: INITIAL_POP for n in names}
+        legacy["available_species"] = [SPECIES_NAMES[i] for i in available_species()]
+    if 'simulated_pop' in state:
+        for key in ("simulated_pop", "initial_pop_at_sim"):
+            vec = state[key]
+            legacy[key] = {SPECIES_NAMES[i]: int(vec[i]) for i in np.flatnonzero(vec)}
+        legacy["simulation_log"] = [format_log_record(r) for r in state.simulation_log]
+    for key in ("is_chain_completed", "is_simulated"):
+        if key in state:
+            legacy[key] = state[key]
+    return legacy
+
+
+def session_memory_report():
+    """세션 키별 메모리 사용량(바이트)을 예전 표현 방식과 비교해 돌려줍니다.
+
+    비율(ratio)은 예전에도 있던 키끼리만 비교한 값이고, 새로 생긴 키(web_history)의
+    크기는 new_total로 따로 셉니다.
+    """
+    state = st.session_state
+    current = {key: deep_sizeof(state[key]) for key in SESSION_KEYS if key in state}
+    legacy = {key: deep_sizeof(value) for key, value in _legacy_session_values().items()}
+    compared = sum(size for key, size in current.items() if key in LEGACY_KEYS)
+    return {
+        "current": current,
+        "legacy": legacy,
+        "current_total": sum(current.values()),
+        "legacy_total": sum(legacy.values()),
+        "new_total": sum(size for key, size in current.items() if key not in LEGACY_KEYS),
+        "ratio": sum(legacy.values()) / compared if compared else 0.0,
+    }
+
+
+def render_memory_report():
+    """사이드바에 세션 메모리 보고서를 표시합니다."""
+    report = session_memory_report()
+    with st.sidebar.expander("🧮 세션 메모리 사용량"):
+        for key, size in report["current"].items():
+            before = f"이전 방식 {report['legacy'][key]:,} B" if key in report["legacy"] else "새로 생긴 키"
+            st.caption(f"`{key}`: {size:,} B ({before})")
+        for key in report["legacy"].keys() - report["current"].keys():
+            st.caption(f"`{key}`: 저장하지 않음 (이전 방식 {report['legacy'][key]:,} B)")
+        st.markdown(
+            f"**합계: {report['current_total']:,} B** (이전 방식 {report['legacy_total']:,} B)  \n"
+            f"예전에도 있던 키끼리 비교하면 {report['ratio']:.1f}배 작아졌어요. "
+            f"(편집 기록 {report['new_total']:,} B 제외)"
+        )
+
+
+# --- 4. 그래프 전송량 ---
+
+def render_chart_payload(images):
+    """이번 실행(rerun)에서 보낸 그래프 이미지 크기를 기록하고 사이드바에 표시합니다."""
+    state = st.session_state
+    payload = sum(len(image) for image in images)
+    state.chart_bytes_total = state.get("chart_bytes_total", 0) + payload
+    state.chart_reruns = state.get("chart_reruns", 0) + 1
+    st.sidebar.caption(
+        f"🖼️ 그래프 이미지 전송량: 이번 실행 {payload:,} B ({len(images)}장) · "
+        f"평균 {state.chart_bytes_total // state.chart_reruns:,} B/실행"
+    )
+    return payload
+
+
+# --- 5. 공유 캐시 통계 ---
+
+def render_cache_report():
+    """사이드바에 프로세스 공유 캐시(시뮬레이션, 배치, 이미지)의 적중률을 표시합니다.
+
+    서버 정보(저장소 파일 경로 등)가 들어 있으므로 운영자용입니다. 환경 변수 ECO_DEBUG=1일
+    때만 보이고, 수업 화면에서는 숨깁니다. (워밍업이 끝날 때 같은 통계가 로그에도 남음)
+    """
+    if os.environ.get("ECO_DEBUG", "0") != "1":
+        return
+    with st.sidebar.expander("📦 공유 캐시 현황"):
+        for stats in cache_stats():
+            st.caption(
+                f"`{stats['name']}`: {stats['entries']:,}/{stats['max_entries']:,}개, {stats['bytes']:,} B · "
+                f"적중 {stats['hits']:,} / 실패 {stats['misses']:,} ({stats['hit_rate']:.0%}) · "
+                f"퇴출 {stats['evictions']:,} · 저장소에서 {stats['store_hits']:,}"
+            )
+        store = get_result_store()
+        if store is not None:
+            st.caption(f"SQLite 저장소 `{store.path}`: {store.size()} · {store.stats}")
@@ -0,0 +1,258 @@
+"""재배포 후에도 남는 시뮬레이션 결과/그래프 이미지 저장소 (로컬 SQLite, 선택 사항).
+
+환경 변수 ECO_RESULT_STORE에 파일 경로를 주면 켜집니다. 없으면 아무것도 하지 않습니다.
+
+    ECO_RESULT_STORE=/data/eco_results.sqlite3 python serve.py
+
+- 메모리 캐시(utils.cache.LRUCache)의 뒤에 붙습니다. 메모리에 없을 때만 SQLite를
+  읽고, 새로 계산한 값은 요청 경로를 막지 않도록 백그라운드 스레드가 모아서 씁니다.
+- 키는 (캐시 종류, 버전, 내용 해시)입니다. 버전은 시뮬레이션이 ENGINE_VERSION,
+  이미지가 RENDER_VERSION이라서, 계산/그리기 방식이 바뀌면 옛 값은 쓰이지 않고
+  저장소를 열 때 지워집니다.
+- 메모리 캐시 적중까지 포함해 키별 사용 횟수를 세 두고, 서버 시작 때
+  prefetch()가 가장 많이 쓰인 키부터 메모리 캐시로 미리 불러옵니다. (워밍업 단계)
+
+값은 pickle 없이 저장합니다. 배열 묶음은 np.savez(allow_pickle=False), 이미지는 바이트 그대로.
+"""
+import atexit
+import io
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+from utils.ecosystem import ENGINE_VERSION
+from utils.render import RENDER_VERSION
+
+logger = logging.getLogger(__name__)
+
+# 캐시 종류별 버전 (utils.cache의 LRUCache 이름과 같음)
+VERSIONS = {"simulation": ENGINE_VERSION, "images": RENDER_VERSION}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    kind    TEXT NOT NULL,
+    version TEXT NOT NULL,
+    key     TEXT NOT NULL,
+    value   BLOB NOT NULL,
+    hits    INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    PRIMARY KEY (kind, version, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_hot ON results (kind, version, hits DESC);
+"""
+
+
+# --- 1. 값 인코딩 ---
+
+def _encode_arrays(arrays):
+    buf = io.BytesIO()
+    np.savez(buf, *arrays)
+    return buf.getvalue()
+
+
+def _decode_arrays(blob):
+    with np.load(io.BytesIO(blob), allow_pickle=False) as data:
+        arrays = tuple(data[f"arr_{i}"] for i in range(len(data.files)))
+    for arr in arrays:
+        arr.flags.writeable = False  # 메모리 캐시의 값처럼 읽기 전용
+    return arrays
+
+
+def _encode_image(image):
+    # SVG는 str, PNG는 bytes (utils.render.render_spec)
+    return b"S" + image.encode("utf-8") if isinstance(image, str) else b"B" + image
+
+
+def _decode_image(blob):
+    blob = bytes(blob)
+    return blob[1:].decode("utf-8") if blob[:1] == b"S" else blob[1:]
+
+
+CODECS = {
+    "simulation": (_encode_arrays, _decode_arrays),
+    "images": (_encode_image, _decode_image),
+}
+
+
+# --- 2. 저장소 ---
+
+class ResultStore:
+    """SQLite 결과 저장소. 읽기는 호출한 스레드에서, 쓰기는 전용 스레드에서 합니다."""
+
+    def __init__(self, path, batch_size=256, flush_interval=0.5, max_queue=10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stats = {"reads": 0, "read_hits": 0, "writes": 0, "dropped": 0, "prefetched": 0}
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._touches = Counter()
+        self._touch_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+
+        self._reader = self._connect()
+        with self._reader:
+            self._reader.executescript(_SCHEMA)
+            # 버전이 바뀐 옛 결과는 다시 쓰이지 않으므로 지웁니다.
+            for kind, version in VERSIONS.items():
+                self._reader.execute("DELETE FROM results WHERE kind = ? AND version != ?", (kind, version))
+
+        self._writer = threading.Thread(target=self._write_loop, name="eco-result-store", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")  # 쓰는 동안에도 읽기가 막히지 않도록
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # 읽기 (요청 경로, 메모리 캐시에 없을 때만)
+    def get(self, kind, key):
+        found = self.get_many(kind, [key])
+        return found.get(key)
+
+    def get_many(self, kind, keys):
+        """있는 키만 {키: 값}으로 돌려줍니다."""
+        if not keys:
+            return {}
+        decode = CODECS[kind][1]
+        marks = ",".join("?" * len(keys))
+        with self._read_lock:
+            rows = self._reader.execute(
+                f"SELECT key, value FROM results WHERE kind = ? AND version = ? AND key IN ({marks})",
+                (kind, VERSIONS[kind], *keys),
+            ).fetchall()
+        self.stats["reads"] += len(keys)
+        self.stats["read_hits"] += len(rows)
+        for key, _ in rows:
+            self.touch(kind, key)
+        return {key: decode(value) for key, value in rows}
+
+    # 쓰기 (백그라운드)
+    def put(self, kind, key, value):
+        """값을 쓰기 대기열에 넣습니다. 대기열이 가득 차면 버립니다. (요청을 막지 않음)"""
+        try:
+            self._queue.put_nowait((kind, key, value))
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def touch(self, kind, key):
+        """키 사용 횟수를 하나 늘립니다. (모아서 쓰기 스레드가 반영)"""
+        with self._touch_lock:
+            self._touches[kind, key] += 1
+
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            batch, stop = [], False
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+                    while len(batch) < self.batch_size:
+                        item = self._queue.get_nowait()
+                        if item is None:
+                            stop = True
+                            break
+                        batch.append(item)
+            except queue.Empty:
+                pass
+            try:
+                self._write_batch(conn, batch)
+            except sqlite3.Error:
+                logger.exception("결과 저장소 쓰기 실패 (%d개)", len(batch))
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                conn.close()
+                return
+
+    def _write_batch(self, conn, batch):
+        with self._touch_lock:
+            touches, self._touches = self._touches, Counter()
+        if not batch and not touches:
+            return
+        now = time.time()
+        rows = [(kind, VERSIONS[kind], key, CODECS[kind][0](value), now) for kind, key, value in batch]
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO results (kind, version, key, value, created) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            conn.executemany(
+                "UPDATE results SET hits = hits + ? WHERE kind = ? AND version = ? AND key = ?",
+                [(n, kind, VERSIONS[kind], key) for (kind, key), n in touches.items()],
+            )
+        self.stats["writes"] += len(rows)
+
+    def flush(self, timeout=10.0):
+        """대기 중인 쓰기가 모두 반영될 때까지 기다립니다. (테스트, 스크립트용)"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join(timeout=10)
+
+    # 시작 시 미리 불러오기
+    def hottest(self, kind, limit):
+        """가장 많이 쓰인 키부터 (키, 값)을 limit개까지 돌려줍니다."""
+        decode = CODECS[kind][1]
+        with self._read_lock:
+            rows = self._reader.execute(
+                "SELECT key, value FROM results WHERE kind = ? AND version = ? ORDER BY hits DESC LIMIT ?",
+                (kind, VERSIONS[kind], limit),
+            ).fetchall()
+        return [(key, decode(value)) for key, value in rows]
+
+    def prefetch(self, caches):
+        """메모리 캐시(LRUCache)들을 저장소에서 사용 횟수가 많은 순서로 채웁니다."""
+        loaded = 0
+        for cache in caches:
+            if cache.name not in CODECS:
+                continue
+            for key, value in reversed(self.hottest(cache.name, cache.max_entries)):
+                cache.put(key, value, persist=False)  # 가장 많이 쓰인 키가 LRU의 맨 뒤에 오도록
+                loaded += 1
+        self.stats["prefetched"] += loaded
+        return loaded
+
+    def size(self):
+        with self._read_lock:
+            return dict(self._reader.execute("SELECT kind, COUNT(*) FROM results GROUP BY kind").fetchall())
+
+
+_store = None
+_failed_path = None  # 열지 못한 경로 (같은 경로로 다시 시도하며 경고를 반복하지 않도록)
+_store_lock = threading.Lock()
+
+
+def get_result_store():
+    """ECO_RESULT_STORE가 설정돼 있으면 프로세스 전체에서 공유하는 저장소를, 아니면 None을 돌려줍니다.
+
+    경로를 열 수 없으면 경고만 남기고 None을 돌려줍니다. (앱은 저장소 없이 실행)
+    """
+    global _store, _failed_path
+    path = os.environ.get("ECO_RESULT_STORE")
+    if not path or path == _failed_path:
+        return None
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = ResultStore(path)
+                logger.info("결과 저장소 열림: %s %s", path, _store.size())
+            except (sqlite3.Error, OSError) as e:
+                # 저장소는 선택 사항이므로, 열 수 없으면 메모리 캐시만으로 계속 동작합니다.
+                logger.warning("결과 저장소를 열 수 없어 사용하지 않습니다 (%s): %s", path, e)
+                _failed_path = path
+                return None
+        return _store
@@ -0,0 +1,148 @@
+"""무작위 먹이그물 생성기 (캐스케이드 모형, 니치 모형).
+
+성능 검사용으로 SIMPLE_ECO(3종)나 카탈로그(14종)보다 훨씬 큰 먹이그물
+(1,000 ~ 100,000종)을 만듭니다. 결과는 run_simulation_step_by_step()이 받는
+compact_ecosystem()과 같은 dict 형태입니다.
+
+    eco = synthetic_ecosystem("niche", size=10_000, connectance=0.001, seed=0)
+    run_simulation_step_by_step(eco, 0, "제거 (멸종)", 0)
+    evaluate_ecosystem(eco, species_tl=eco["species_tl"], names=eco["names"])
+
+- 생물 ID는 0..size-1이고, 카탈로그 ID가 아니므로 영양 단계와 이름을 dict에
+  함께 넣어 둡니다. ("species_tl", "names") 카탈로그 기반 함수에는 이 값을
+  species_tl=, names= 인자로 넘겨 주세요.
+- 연결도(connectance) C = 관계 수 / 생물 수² 입니다. 관계 수의 기댓값은 C·S².
+  S가 크면 C를 작게 주세요. (C·S = 생물 한 종당 평균 관계 수)
+- 같은 seed면 항상 같은 먹이그물이 나옵니다.
+- S×S 행렬을 만들지 않으므로 메모리는 관계 수에 비례합니다. (관계 하나 8바이트)
+
+캐스케이드 모형(Cohen & Newman): 생물에 순위를 매기고, 순위가 높은 생물이 낮은
+생물을 확률 p = 2CS/(S-1)로 먹습니다.
+
+니치 모형(Williams & Martinez): 생물마다 니치 값 n ~ U(0, 1), 먹이 범위
+r = n·x (x ~ Beta(1, 1/(2C) - 1)), 범위 중심 c ~ U(r/2, n)를 정하고, 니치 값이
+[c - r/2, c + r/2] 안에 드는 생물을 모두 먹습니다. 두 모형 모두 생물 ID가 곧
+순위(니치 값 순서)입니다.
+"""
+import numpy as np
+
+from utils.ecosystem import POP_DTYPE, TL_ORDER
+
+SYNTHETIC_ID_DTYPE = np.int32
+
+# 영양 단계별 초기 개체수 (TL_ORDER 순서, SIMPLE_ECO의 생산자 100 / 1차 50 / 3차 20과 같은 비율)
+TL_INITIAL_POP = np.array([100, 50, 30, 20, 10], dtype=POP_DTYPE)
+
+# 밀집 표본 추출(순위 쌍마다 난수 하나)을 쓸 최대 쌍 수. 넘으면 관계만 골라 뽑습니다.
+_DENSE_PAIRS = 20_000_000
+
+
+# --- 1. 관계(간선) 만들기 ---
+
+def _pair_from_index(k):
+    """i < j인 순위 쌍의 일련번호 k = j(j-1)/2 + i 를 (i, j)로 되돌립니다."""
+    j = ((1 + np.sqrt(1 + 8 * k.astype(np.float64))) // 2).astype(np.int64)
+    # 부동소수점 오차 보정
+    j -= j * (j - 1) // 2 > k
+    j += (j + 1) * j // 2 <= k
+    return k - j * (j - 1) // 2, j
+
+
+def cascade_edges(size, connectance, rng):
+    """캐스케이드 모형의 [먹이, 포식자] 간선 배열. 포식자의 ID가 항상 더 큽니다."""
+    pairs = size * (size - 1) // 2
+    if pairs == 0:
+        return np.empty((0, 2), dtype=SYNTHETIC_ID_DTYPE)
+    p = min(1.0, 2 * connectance * size / (size - 1))
+    if pairs <= _DENSE_PAIRS:
+        k = np.flatnonzero(rng.random(pairs) < p)
+    else:
+        k = np.sort(rng.choice(pairs, size=rng.binomial(pairs, p), replace=False))
+    prey, predator = _pair_from_index(k)
+    edges = np.column_stack([prey, predator]).astype(SYNTHETIC_ID_DTYPE)
+    return edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+
+
+def niche_edges(size, connectance, rng):
+    """니치 모형의 [먹이, 포식자] 간선 배열. 생물 ID는 니치 값 순서입니다. (자기 자신을 먹는 관계는 뺌)"""
+    if not 0 < connectance < 0.5:
+        raise ValueError(f"니치 모형의 연결도는 0과 0.5 사이여야 합니다: {connectance}")
+    niche = np.sort(rng.random(size))
+    ranges = niche * rng.beta(1.0, 1.0 / (2 * connectance) - 1.0, size)
+    ranges[0] = 0.0  # 니치 값이 가장 작은 생물은 아무것도 먹지 않음 (생산자가 적어도 하나)
+    centers = rng.uniform(ranges / 2, niche)
+
+    # 니치 값이 정렬돼 있으므로 포식자마다 먹이는 ID가 연속된 한 구간입니다.
+    lo = np.searchsorted(niche, centers - ranges / 2, side="left")
+    hi = np.searchsorted(niche, centers + ranges / 2, side="right")
+    hi[0] = lo[0]
+    counts = hi - lo
+    predator = np.repeat(np.arange(size, dtype=np.int64), counts)
+    starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+    prey = starts + np.arange(counts.sum())
+
+    keep = prey != predator
+    edges = np.column_stack([prey[keep], predator[keep]]).astype(SYNTHETIC_ID_DTYPE)
+    return edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+
+
+MODELS = {"cascade": cascade_edges, "niche": niche_edges}
+
+
+# --- 2. 영양 단계 ---
+
+def trophic_levels(size, edges):
+    """TL_ORDER 인덱스(0~4)의 영양 단계 배열.
+
+    먹이가 없는 생물은 생산자(0)이고, 소비자는 생산자에서 가장 짧은 먹이 경로 길이로
+    1차(1), 2차(2), 3차 이상(3)을 정합니다. 잡아먹히지 않는 소비자 중 경로 길이가
+    3 이상이면 최종 소비자(4)입니다. 생산자에서 닿지 않는 소비자(먹이 순환 안에서만
+    먹는 생물)는 1차 소비자로 둡니다.
+    """
+    prey, predator = edges[:, 0], edges[:, 1]
+    level = np.full(size, -1, dtype=np.int32)
+    basal = np.bincount(predator, minlength=size) == 0
+    level[basal] = 0
+
+    # 생산자에서 시작하는 너비 우선 탐색 (단계마다 간선 배열을 한 번 훑음)
+    frontier, depth = basal, 0
+    while True:
+        step = frontier[prey] & (level[predator] < 0)
+        if not step.any():
+            break
+        depth += 1
+        reached = np.unique(predator[step])
+        level[reached] = depth
+        frontier = np.zeros(size, dtype=bool)
+        frontier[reached] = True
+
+    tl = np.where(level < 0, 1, np.minimum(level, 3)).astype(np.int8)
+    top = np.bincount(prey, minlength=size) == 0
+    tl[top & (level >= 3)] = TL_ORDER.index("최종 소비자")
+    return tl
+
+
+# --- 3. 모형 dict ---
+
+def synthetic_ecosystem(model="niche", size=1000, connectance=0.05, seed=0, removal_factor=0.4):
+    """model("cascade" 또는 "niche")로 size종 먹이그물을 만들어 시뮬레이션 입력 형태로 돌려줍니다."""
+    if model not in MODELS:
+        raise ValueError(f"알 수 없는 먹이그물 모형: {model} (가능: {', '.join(MODELS)})")
+    rng = np.random.default_rng(seed)
+    edges = MODELS[model](size, connectance, rng)
+    species_tl = trophic_levels(size, edges)
+    return {
+        "name": f"{model} S={size} C={connectance} seed={seed}",
+        "nodes": np.arange(size, dtype=SYNTHETIC_ID_DTYPE),
+        "edges": edges,
+        "initial_population": TL_INITIAL_POP[species_tl],
+        "removal_factor": removal_factor,
+        "species_tl": species_tl,
+        "names": tuple(f"종{i}" for i in range(size)),
+    }
+
+
+def connectance_of(ecosystem_data):
+    """실제 연결도 (관계 수 / 생물 수²)."""
+    size = len(ecosystem_data["nodes"])
+    return len(ecosystem_data["edges"]) / size ** 2 if size else 0.0
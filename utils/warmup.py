@@ -0,0 +1,176 @@
+"""서버 워밍업: 첫 학생이 접속하기 전에 무거운 준비 작업을 끝내 둡니다.
+
+배포 직후 첫 요청이 부담하던 작업을 미리 실행해 프로세스 전체 캐시에 넣습니다.
+1. 폰트: 나눔고딕 CSS(base64) 생성, matplotlib에 폰트 등록
+2. matplotlib: pyplot import, 폰트 캐시 구축, 빈 그림 한 번 렌더링
+   렌더링 워커 프로세스도 미리 띄워 각자 matplotlib/폰트를 불러 두게 합니다.
+3. 결과 저장소(ECO_RESULT_STORE): 가장 많이 쓰인 시뮬레이션 결과와 그래프를 메모리로
+4. SIMPLE_ECO: 레이아웃, 실험 전/대기 그래프, 가능한 모든 충격 결과와 그 그래프
+
+`python serve.py`로 서버를 띄우면 서버 시작 전에 모든 단계가 동기적으로 실행됩니다.
+`streamlit run`으로 띄운 경우에는 첫 페이지 실행 시 백그라운드 스레드로 가벼운 단계
+(LAZY_WARM_UP_STAGES: 폰트, matplotlib)만 실행합니다. SIMPLE_ECO 그래프 100여 장을
+서버 프로세스 안에서 그리면 GIL을 오래 잡아 학생들의 첫 요청이 오히려 느려지기 때문입니다.
+두 경로 모두 같은 캐시 함수를 호출하므로 이미 계산된 값은 다시 계산하지 않습니다.
+환경 변수 ECO_WARM_UP=0 이면 워밍업을 끕니다. (import 시간 측정 등)
+
+모듈 자체는 가볍게 유지하기 위해 무거운 모듈은 각 단계 함수 안에서 불러옵니다.
+"""
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 페이지 2 사이드바에서 고를 수 있는 충격 설정 전체
+CHANGE_VALUES = range(-100, 101, 10)
+
+# 단계별 소요 시간(초). 워밍업이 끝나면 "total"이 채워집니다.
+WARM_UP_REPORT = {}
+
+_lock = threading.Lock()
+_started = False
+
+
+def shock_settings(ecosystem_data):
+    """ecosystem_data에 줄 수 있는 모든 (대상, 충격 종류, 변화율) 조합."""
+    for target in ecosystem_data["nodes"].tolist():
+        yield target, "제거 (멸종)", 0
+        for value in CHANGE_VALUES:
+            yield target, "개체 수 변경", value
+
+
+def _warm_fonts():
+    from utils.fonts import build_nanum_font_css
+    from utils.plotting import get_font_properties, register_fonts
+
+    build_nanum_font_css()
+    register_fonts()
+    get_font_properties()
+
+
+def _warm_matplotlib():
+    from matplotlib import font_manager
+
+    from utils.plotting import get_font_properties, new_figure
+    from utils.render import figure_to_png
+
+    fp = get_font_properties()
+    if fp is not None:
+        font_manager.findfont(fp)
+    fig, ax = new_figure(figsize=(1, 1))
+    ax.set_title("한글", fontproperties=fp)
+    figure_to_png(fig, palette=32)  # 팔레트 PNG 변환(PIL)도 미리 불러 둠
+
+
+def _warm_result_store():
+    from utils.cache import SIMULATION_CACHE
+    from utils.charts import IMAGE_CACHE
+    from utils.store import get_result_store
+
+    store = get_result_store()
+    if store is not None:
+        store.prefetch([SIMULATION_CACHE, IMAGE_CACHE])
+
+
+def _warm_render_pool():
+    from utils.render_pool import get_render_pool
+
+    get_render_pool().warm()
+
+
+def _warm_simple_eco_figures():
+    from utils.charts import ecosystem_spec, pyramid_spec, render_figures
+    from utils.ecosystem import SIMPLE_ECO
+
+    nodes, edges = SIMPLE_ECO["nodes"], SIMPLE_ECO["edges"]
+    pop = SIMPLE_ECO["initial_population"]
+    render_figures([
+        ecosystem_spec(nodes, edges, pop, "실험 전 (먹이그물)", pop),
+        pyramid_spec(pop, "실험 전 (생태 피라미드)"),
+        ecosystem_spec(nodes, edges, pop, "실험 대기 중", pop),
+        pyramid_spec(pop, "실험 대기 중"),
+    ])
+
+
+def _warm_simple_eco_outcomes():
+    from utils.cache import cached_simulation
+    from utils.charts import ecosystem_spec, pyramid_spec, render_figures
+    from utils.ecosystem import SIMPLE_ECO
+
+    nodes, edges = SIMPLE_ECO["nodes"], SIMPLE_ECO["edges"]
+    specs = []
+    for target, change_type, value in shock_settings(SIMPLE_ECO):
+        new_pop, initial_pop, _ = cached_simulation(SIMPLE_ECO, target, change_type, value)
+        specs.append(ecosystem_spec(nodes, edges, new_pop, "실험 후 (먹이그물)", initial_pop))
+        specs.append(pyramid_spec(new_pop, "실험 후 (생태 피라미드)"))
+    # 같은 결과가 여러 번 나오므로 중복을 걸러 워커 풀에 한 번에 보냅니다.
+    render_figures(specs)
+
+
+WARM_UP_STAGES = (
+    ("fonts", _warm_fonts),
+    ("matplotlib", _warm_matplotlib),
+    ("result_store", _warm_result_store),
+    ("render_pool", _warm_render_pool),
+    ("simple_eco_figures", _warm_simple_eco_figures),
+    ("simple_eco_outcomes", _warm_simple_eco_outcomes),
+)
+
+# streamlit run에서 첫 페이지가 백그라운드로 실행하는 단계
+LAZY_WARM_UP_STAGES = ("fonts", "matplotlib")
+
+
+def warm_up(stages=None):
+    """워밍업 단계(기본: 모두)를 실행하고 단계별 소요 시간(초)을 돌려줍니다."""
+    report = {}
+    t_start = time.perf_counter()
+    for name, stage in WARM_UP_STAGES:
+        if stages is not None and name not in stages:
+            continue
+        t0 = time.perf_counter()
+        try:
+            stage()
+        except Exception:
+            # 워밍업 실패는 서비스에 영향을 주지 않도록 기록만 하고 넘어갑니다.
+            logger.exception("워밍업 단계 '%s' 실패", name)
+        report[name] = time.perf_counter() - t0
+    report["total"] = time.perf_counter() - t_start
+
+    WARM_UP_REPORT.update(report)
+    logger.info(
+        "워밍업 완료: %.2f초 (%s)", report["total"],
+        ", ".join(f"{k} {v:.2f}s" for k, v in report.items() if k != "total"),
+    )
+    from utils.cache import cache_stats
+    for stats in cache_stats():
+        logger.info("공유 캐시 %(name)s: %(entries)d개, %(bytes)d B", stats)
+    return report
+
+
+def start_warm_up(background=True):
+    """프로세스에서 처음 호출될 때 한 번만 워밍업을 시작합니다.
+
+    background=True(페이지에서 호출)이면 LAZY_WARM_UP_STAGES만 스레드로 실행하고,
+    False(serve.py)이면 모든 단계를 끝낸 뒤 돌아옵니다.
+    """
+    global _started
+    if os.environ.get("ECO_WARM_UP", "1") == "0":
+        return
+    with _lock:
+        if _started:
+            return
+        _started = True
+    if background:
+        threading.Thread(target=warm_up, args=(LAZY_WARM_UP_STAGES,), name="eco-warm-up", daemon=True).start()
+    else:
+        warm_up()
+
+
+if __name__ == "__main__":
+    # 배포 스크립트에서 디스크의 matplotlib 폰트 캐시만 미리 만들어 둘 때:
+    #   python -m utils.warmup
+    logging.basicConfig(level=logging.INFO)
+    for name, seconds in warm_up().items():
+        print(f"{name:<20} {seconds:6.2f}s")